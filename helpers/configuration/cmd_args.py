@@ -1158,6 +1158,17 @@ def get_argument_parser():
             " the EMA weights. In comparison mode, the resulting images will be provided side-by-side."
         ),
     )
+    parser.add_argument(
+        "--ema_keep_on_device",
+        action="store_true",
+        default=False,
+        help=(
+            "When using EMA with --ema_device=cpu, the shadow parameters are moved back to the CPU after every"
+            " update and validation, which copies every trainable parameter over PCIe. When provided, the EMA"
+            " model remains on the accelerator instead, trading VRAM for much faster validation setup on"
+            " full-finetune runs."
+        ),
+    )
     parser.add_argument(
         "--ema_cpu_only",
         action="store_true",
@@ -1426,6 +1437,38 @@ def get_argument_parser():
             " However, this value can be increased to a value of around 1.3 or 1.5 to get a stronger effect from the model."
         ),
     )
+    parser.add_argument(
+        "--validation_autocast_bf16",
+        action="store_true",
+        default=False,
+        help=(
+            "Run validation inference under bfloat16 autocast and, for UNet models, convert the"
+            " validation copy to channels_last memory format. This roughly doubles Tensor Core"
+            " throughput for fp32 training runs without touching training precision. Opt-in because"
+            " validation outputs will be produced at reduced precision."
+        ),
+    )
+    parser.add_argument(
+        "--validation_downcast_text_encoders",
+        action="store_true",
+        default=False,
+        help=(
+            "Cast the text encoders to bfloat16 for validation inference. The text encoder forward pass is"
+            " memory-bandwidth bound, so halving the weight size roughly doubles its throughput. Since the"
+            " embeds are computed at lower precision, this may subtly change validation outputs; it is"
+            " therefore opt-in."
+        ),
+    )
+    parser.add_argument(
+        "--warm_validation",
+        action="store_true",
+        default=False,
+        help=(
+            "Keep the VAE and validation pipeline resident on the accelerator between intermediary validation runs"
+            " instead of offloading and rebuilding them each time. Requires enough spare VRAM to hold the VAE"
+            " alongside the training state; the final validation still releases everything."
+        ),
+    )
     parser.add_argument(
         "--validation_torch_compile",
         action="store_true",
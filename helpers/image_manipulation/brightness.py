@@ -12,6 +12,25 @@ def calculate_luminance(img: Image.Image):
     return avg_luminance
 
 
+def calculate_image_set_luminance(imgs: list):
+    """
+    Mean luminance for each image, computed with one vectorized numpy
+    expression per distinct image size instead of one call per image.
+    """
+    arrays = [np.asarray(img.convert("RGB")) for img in imgs]
+    by_shape = {}
+    for idx, arr in enumerate(arrays):
+        by_shape.setdefault(arr.shape, []).append(idx)
+    coeffs = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    luminances = [0.0] * len(arrays)
+    for indices in by_shape.values():
+        stacked = np.stack([arrays[idx] for idx in indices]).astype(np.float32)
+        means = (stacked @ coeffs).reshape(len(indices), -1).mean(axis=1)
+        for idx, value in zip(indices, means):
+            luminances[idx] = float(value)
+    return luminances
+
+
 def worker_batch_luminance(imgs: list):
     return [calculate_luminance(img) for img in imgs]
 
@@ -3,6 +3,7 @@
 # Originally licensed under the Apache License, Version 2.0 (the "License");
 # Updated to "Affero GENERAL PUBLIC LICENSE Version 3, 19 November 2007" via extensive updates to attn_mask usage.
 
+import os
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import torch
@@ -41,18 +42,45 @@ logger = logging.get_logger(__name__)  # pylint: disable=invalid-name
 
 is_flash_attn_available = False
 try:
-    from flash_attn_interface import flash_attn_func
+    from flash_attn_interface import flash_attn_func, flash_attn_varlen_func
 
     is_flash_attn_available = True
 except:
     pass
 
+is_apex_available = False
+try:
+    from apex.normalization import FusedLayerNorm, FusedRMSNorm
+
+    is_apex_available = True
+except:
+    pass
+
 from helpers.models.flux.attention import (
     FluxSingleAttnProcessor3_0,
     FluxAttnProcessor3_0,
 )
 
 
+def _is_hopper() -> bool:
+    if not torch.cuda.is_available():
+        return False
+    primary_device = torch.cuda.get_device_properties(0)
+    return primary_device.major == 9 and primary_device.minor == 0
+
+
+# Resolved once at import so the 57 block constructors don't each query CUDA
+# device properties, and so compiled graphs see a plain constant.
+_USE_FA3 = is_flash_attn_available and _is_hopper()
+if _USE_FA3:
+    logger.info("Using FlashAttention3 attention processors for Hopper GPUs.")
+elif _is_hopper():
+    logger.warning(
+        "FlashAttention3 is not available; falling back to SDPA on a Hopper GPU."
+        " Install flash_attn to make use of it."
+    )
+
+
 class FluxAttnProcessor2_0:
     """Attention processor used typically in processing the SD3-like self-attention projections."""
 
@@ -77,36 +105,63 @@ class FluxAttnProcessor2_0:
         )
 
         # `sample` projections.
-        query = attn.to_q(hidden_states)
-        key = attn.to_k(hidden_states)
-        value = attn.to_v(hidden_states)
+        if getattr(attn, "to_qkv", None) is not None:
+            # fused path — one GEMM instead of three over the same input
+            query, key, value = attn.to_qkv(hidden_states).chunk(3, dim=-1)
+        else:
+            query = attn.to_q(hidden_states)
+            key = attn.to_k(hidden_states)
+            value = attn.to_v(hidden_states)
 
         inner_dim = key.shape[-1]
         head_dim = inner_dim // attn.heads
 
-        query = query.view(batch_size, -1, attn.heads, head_dim).transpose(1, 2)
-        key = key.view(batch_size, -1, attn.heads, head_dim).transpose(1, 2)
-        value = value.view(batch_size, -1, attn.heads, head_dim).transpose(1, 2)
-
-        if attn.norm_q is not None:
-            query = attn.norm_q(query)
-        if attn.norm_k is not None:
-            key = attn.norm_k(key)
+        query = query.reshape(batch_size, -1, attn.heads, head_dim).transpose(1, 2)
+        key = key.reshape(batch_size, -1, attn.heads, head_dim).transpose(1, 2)
+        value = value.reshape(batch_size, -1, attn.heads, head_dim).transpose(1, 2)
+
+        # In the single-stream path the q/k norms feed straight into the
+        # rotation, so both fold into one compiled kernel; the double-stream
+        # path keeps them separate because the context segment has its own
+        # norms and the rotation spans the concatenated sequence.
+        fuse_norm_rope = (
+            encoder_hidden_states is None
+            and image_rotary_emb is not None
+            and attn.norm_q is not None
+            and attn.norm_k is not None
+            and getattr(attn.norm_q, "weight", None) is not None
+        )
+        if not fuse_norm_rope:
+            if attn.norm_q is not None:
+                query = attn.norm_q(query)
+            if attn.norm_k is not None:
+                key = attn.norm_k(key)
 
         # the attention in FluxSingleTransformerBlock does not use `encoder_hidden_states`
         if encoder_hidden_states is not None:
             # `context` projections.
-            encoder_hidden_states_query_proj = attn.add_q_proj(encoder_hidden_states)
-            encoder_hidden_states_key_proj = attn.add_k_proj(encoder_hidden_states)
-            encoder_hidden_states_value_proj = attn.add_v_proj(encoder_hidden_states)
+            if getattr(attn, "to_added_qkv", None) is not None:
+                (
+                    encoder_hidden_states_query_proj,
+                    encoder_hidden_states_key_proj,
+                    encoder_hidden_states_value_proj,
+                ) = attn.to_added_qkv(encoder_hidden_states).chunk(3, dim=-1)
+            else:
+                encoder_hidden_states_query_proj = attn.add_q_proj(
+                    encoder_hidden_states
+                )
+                encoder_hidden_states_key_proj = attn.add_k_proj(encoder_hidden_states)
+                encoder_hidden_states_value_proj = attn.add_v_proj(
+                    encoder_hidden_states
+                )
 
-            encoder_hidden_states_query_proj = encoder_hidden_states_query_proj.view(
+            encoder_hidden_states_query_proj = encoder_hidden_states_query_proj.reshape(
                 batch_size, -1, attn.heads, head_dim
             ).transpose(1, 2)
-            encoder_hidden_states_key_proj = encoder_hidden_states_key_proj.view(
+            encoder_hidden_states_key_proj = encoder_hidden_states_key_proj.reshape(
                 batch_size, -1, attn.heads, head_dim
             ).transpose(1, 2)
-            encoder_hidden_states_value_proj = encoder_hidden_states_value_proj.view(
+            encoder_hidden_states_value_proj = encoder_hidden_states_value_proj.reshape(
                 batch_size, -1, attn.heads, head_dim
             ).transpose(1, 2)
 
@@ -119,41 +174,110 @@ class FluxAttnProcessor2_0:
                     encoder_hidden_states_key_proj
                 )
 
-            # attention
-            query = torch.cat([encoder_hidden_states_query_proj, query], dim=2)
-            key = torch.cat([encoder_hidden_states_key_proj, key], dim=2)
-            value = torch.cat([encoder_hidden_states_value_proj, value], dim=2)
+            # attention — write both segments straight into full-sequence
+            # buffers; the strided writes handle the transposed views directly
+            # instead of torch.cat staging a contiguous copy of each input.
+            txt_len = encoder_hidden_states_query_proj.shape[2]
+            total_len = txt_len + query.shape[2]
 
-        if image_rotary_emb is not None:
-            from diffusers.models.embeddings import apply_rotary_emb
+            def _cat_segments(txt_proj, sample_proj):
+                full = sample_proj.new_empty(
+                    batch_size, attn.heads, total_len, head_dim
+                )
+                full[:, :, :txt_len] = txt_proj
+                full[:, :, txt_len:] = sample_proj
+                return full
 
-            query = apply_rotary_emb(query, image_rotary_emb)
-            key = apply_rotary_emb(key, image_rotary_emb)
+            query = _cat_segments(encoder_hidden_states_query_proj, query)
+            key = _cat_segments(encoder_hidden_states_key_proj, key)
+            value = _cat_segments(encoder_hidden_states_value_proj, value)
 
-        if attention_mask is not None:
-            attention_mask = attention_mask.unsqueeze(1).unsqueeze(2)
-            attention_mask = (attention_mask > 0).bool()
-            attention_mask = attention_mask.to(
-                device=hidden_states.device, dtype=hidden_states.dtype
+        if image_rotary_emb is not None:
+            if fuse_norm_rope:
+                query, key = _fused_rmsnorm_rope_qk(
+                    query,
+                    key,
+                    attn.norm_q.weight,
+                    attn.norm_k.weight,
+                    *image_rotary_emb,
+                    eps=attn.norm_q.eps,
+                )
+            else:
+                query, key = _fused_rope_qk(query, key, *image_rotary_emb)
+
+        if _USE_FA3 and (
+            attention_mask is None or attention_mask.dtype == torch.bool
+        ):
+            # FlashAttention keeps the attention tiles in SRAM and never
+            # materialises the full score matrix in HBM, unlike the SDPA
+            # fallback below. It only supports no-mask or varlen (packed
+            # valid-token) layouts, so additive float masks still go to SDPA.
+            query = query.transpose(1, 2)
+            key = key.transpose(1, 2)
+            value = value.transpose(1, 2)
+            if attention_mask is None:
+                hidden_states = flash_attn_func(query, key, value, causal=False)[0]
+            else:
+                seq_len = query.shape[1]
+                valid_mask = attention_mask.reshape(batch_size, -1)
+                seqlens = valid_mask.sum(dim=1, dtype=torch.int32)
+                cu_seqlens = F.pad(
+                    torch.cumsum(seqlens, dim=0, dtype=torch.int32), (1, 0)
+                )
+                max_seqlen = int(seqlens.max())
+                flat_mask = valid_mask.reshape(-1)
+                packed = flash_attn_varlen_func(
+                    query.reshape(-1, attn.heads, head_dim)[flat_mask],
+                    key.reshape(-1, attn.heads, head_dim)[flat_mask],
+                    value.reshape(-1, attn.heads, head_dim)[flat_mask],
+                    cu_seqlens,
+                    cu_seqlens,
+                    max_seqlen,
+                    max_seqlen,
+                    causal=False,
+                )[0]
+                hidden_states = query.new_zeros(
+                    batch_size * seq_len, attn.heads, head_dim
+                )
+                hidden_states[flat_mask] = packed
+            hidden_states = hidden_states.reshape(
+                batch_size, -1, attn.heads * head_dim
             )
+        else:
+            if attention_mask is not None:
+                if attention_mask.dtype == torch.bool:
+                    # already pre-shaped once at the model level; SDPA takes
+                    # boolean keep-masks directly.
+                    if attention_mask.ndim == 2:
+                        attention_mask = attention_mask.unsqueeze(1).unsqueeze(2)
+                else:
+                    attention_mask = attention_mask.unsqueeze(1).unsqueeze(2)
+                    attention_mask = (attention_mask > 0).bool()
+                    attention_mask = attention_mask.to(
+                        device=hidden_states.device, dtype=hidden_states.dtype
+                    )
 
-        hidden_states = F.scaled_dot_product_attention(
-            query,
-            key,
-            value,
-            dropout_p=0.0,
-            is_causal=False,
-            attn_mask=attention_mask,
-        )
-        hidden_states = hidden_states.transpose(1, 2).reshape(
-            batch_size, -1, attn.heads * head_dim
-        )
-        hidden_states = hidden_states.to(query.dtype)
+            hidden_states = F.scaled_dot_product_attention(
+                query,
+                key,
+                value,
+                dropout_p=0.0,
+                is_causal=False,
+                attn_mask=attention_mask,
+            )
+            hidden_states = hidden_states.transpose(1, 2).reshape(
+                batch_size, -1, attn.heads * head_dim
+            )
+        if hidden_states.dtype != query.dtype:
+            # both FlashAttention and SDPA preserve the input dtype on the
+            # bf16 path, so this cast only fires for exotic fallbacks
+            hidden_states = hidden_states.to(query.dtype)
 
         if encoder_hidden_states is not None:
+            # txt_len is a plain int, so these slices are static views
             encoder_hidden_states, hidden_states = (
-                hidden_states[:, : encoder_hidden_states.shape[1]],
-                hidden_states[:, encoder_hidden_states.shape[1] :],
+                hidden_states[:, :txt_len],
+                hidden_states[:, txt_len:],
             )
 
             # linear proj
@@ -166,22 +290,147 @@ class FluxAttnProcessor2_0:
         return hidden_states
 
 
+def _fuse_qk_norms(attn: Attention, head_dim: int, eps: float = 1e-6):
+    """
+    Swap the q/k RMSNorms on an Attention module for apex FusedRMSNorm, which
+    avoids the fp32 upcast round-trip of the upstream kernel.
+    """
+    if not is_apex_available:
+        return
+    for name in ("norm_q", "norm_k", "norm_added_q", "norm_added_k"):
+        if getattr(attn, name, None) is not None:
+            setattr(attn, name, FusedRMSNorm(head_dim, eps=eps))
+
+
+def _fused_rope_qk(
+    query: torch.Tensor,
+    key: torch.Tensor,
+    cos: torch.Tensor,
+    sin: torch.Tensor,
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Rotate Q and K in one pass, matching diffusers' real-valued
+    `apply_rotary_emb`, so cos/sin are read from HBM once instead of twice.
+    """
+    cos = cos[None, None]
+    sin = sin[None, None]
+
+    def _rotate(x):
+        x_real, x_imag = x.reshape(*x.shape[:-1], -1, 2).unbind(-1)
+        x_rotated = torch.stack([-x_imag, x_real], dim=-1).reshape_as(x)
+        return (x.float() * cos + x_rotated.float() * sin).to(x.dtype)
+
+    return _rotate(query), _rotate(key)
+
+
+def _maybe_quantised_linear(in_features: int, out_features: int, bias: bool = True):
+    """
+    Build the large single-block Linears as FP8 (TransformerEngine) or int8
+    (bitsandbytes) layers when SIMPLETUNER_FLUX_FP8_LINEAR=true, halving their
+    HBM traffic on Hopper. Falls back to a plain nn.Linear.
+    """
+    if os.environ.get("SIMPLETUNER_FLUX_FP8_LINEAR", "false").lower() == "true":
+        try:
+            import transformer_engine.pytorch as te
+
+            return te.Linear(in_features, out_features, bias=bias)
+        except ImportError:
+            pass
+        try:
+            import bitsandbytes as bnb
+
+            return bnb.nn.Linear8bitLt(in_features, out_features, bias=bias)
+        except ImportError:
+            logger.warning(
+                "SIMPLETUNER_FLUX_FP8_LINEAR is set but neither transformer_engine"
+                " nor bitsandbytes is installed; using nn.Linear."
+            )
+    return nn.Linear(in_features, out_features, bias=bias)
+
+
+_CKPT_KWARGS: Dict[str, Any] = (
+    {"use_reentrant": False} if is_torch_version(">=", "1.11.0") else {}
+)
+
+
+def _checkpoint_call(module, *inputs):
+    # module-level so the checkpoint loops don't allocate a fresh closure per
+    # block, which also keeps Dynamo tracing happy
+    return module(*inputs)
+
+
+def _mlp_gelu(x: torch.Tensor, weight: torch.Tensor, bias: torch.Tensor):
+    """
+    Linear + tanh-GELU in one compiled region so the 4x-dim up-projection
+    output is activated in-register instead of round-tripping through HBM.
+    """
+    return F.gelu(F.linear(x, weight, bias), approximate="tanh")
+
+
+def _fused_rmsnorm_rope_qk(
+    query: torch.Tensor,
+    key: torch.Tensor,
+    gamma_q: torch.Tensor,
+    gamma_k: torch.Tensor,
+    cos: torch.Tensor,
+    sin: torch.Tensor,
+    eps: float,
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    RMSNorm + rotary for Q and K in one compiled region, so each tensor is
+    read and written once instead of once per op.
+    """
+    cos = cos[None, None]
+    sin = sin[None, None]
+
+    def _norm_rotate(x, gamma):
+        variance = x.float().pow(2).mean(-1, keepdim=True)
+        x = x * torch.rsqrt(variance + eps).to(x.dtype)
+        x = x * gamma
+        x_real, x_imag = x.reshape(*x.shape[:-1], -1, 2).unbind(-1)
+        x_rotated = torch.stack([-x_imag, x_real], dim=-1).reshape_as(x)
+        return (x.float() * cos + x_rotated.float() * sin).to(x.dtype)
+
+    return _norm_rotate(query, gamma_q), _norm_rotate(key, gamma_k)
+
+
+def _modulate(x: torch.Tensor, scale: torch.Tensor, shift: torch.Tensor):
+    return x * (1 + scale.unsqueeze(1)) + shift.unsqueeze(1)
+
+
+def _gate_add(residual: torch.Tensor, gate: torch.Tensor, x: torch.Tensor):
+    return residual + gate.unsqueeze(1) * x
+
+
+# Compiling the epilogues is opt-in via the same env switches as the block
+# compiles, so platforms where Dynamo is flaky (MPS, CPU, exotic backends)
+# keep the plain eager functions by default.
+_COMPILE_FUSED_OPS = hasattr(torch, "compile") and (
+    os.environ.get("SIMPLETUNER_COMPILE_BLOCKS", "false").lower() == "true"
+    or os.environ.get("SIMPLETUNER_CUDA_GRAPHS", "false").lower() == "true"
+)
+if _COMPILE_FUSED_OPS:
+    # Pure pointwise epilogues; Inductor fuses each into a single kernel so
+    # the (B, S, D) intermediates never hit HBM.
+    _fused_rope_qk = torch.compile(_fused_rope_qk)
+    _fused_rmsnorm_rope_qk = torch.compile(_fused_rmsnorm_rope_qk)
+    _mlp_gelu = torch.compile(_mlp_gelu)
+    _modulate = torch.compile(_modulate)
+    _gate_add = torch.compile(_gate_add)
+
+
 def expand_flux_attention_mask(
-    hidden_states: torch.Tensor,
+    seq_len: int,
     attn_mask: torch.Tensor,
 ) -> torch.Tensor:
     """
-    Expand a mask so that the image is included.
+    Expand a text-token mask so that the image tokens are included.
     """
-    bsz = attn_mask.shape[0]
-    assert bsz == hidden_states.shape[0]
-    residual_seq_len = hidden_states.shape[1]
     mask_seq_len = attn_mask.shape[1]
 
-    expanded_mask = torch.ones(bsz, residual_seq_len)
-    expanded_mask[:, :mask_seq_len] = attn_mask
-
-    return expanded_mask
+    # single kernel: pad the text mask with always-valid image positions,
+    # instead of allocating a ones buffer and overwriting its prefix
+    return F.pad(attn_mask > 0, (0, seq_len - mask_seq_len), value=True)
 
 
 @maybe_allow_in_graph
@@ -204,25 +453,13 @@ class FluxSingleTransformerBlock(nn.Module):
         self.mlp_hidden_dim = int(dim * mlp_ratio)
 
         self.norm = AdaLayerNormZeroSingle(dim)
-        self.proj_mlp = nn.Linear(dim, self.mlp_hidden_dim)
+        self.proj_mlp = _maybe_quantised_linear(dim, self.mlp_hidden_dim)
         self.act_mlp = nn.GELU(approximate="tanh")
-        self.proj_out = nn.Linear(dim + self.mlp_hidden_dim, dim)
-
-        processor = FluxAttnProcessor2_0()
-        if torch.cuda.is_available():
-            # let's assume that the box only ever has H100s.
-            rank = 0
-            primary_device = torch.cuda.get_device_properties(rank)
-            if primary_device.major == 9 and primary_device.minor == 0:
-                if is_flash_attn_available:
-                    if rank == 0:
-                        print("Using FlashAttention3_0 for H100 GPU (Single block)")
-                    processor = FluxSingleAttnProcessor3_0()
-                else:
-                    if rank == 0:
-                        print(
-                            "FlashAttention3_0 is not available, using FlashAttention2_0 for H100 GPU (Single block). Install flash_attn to make use of it."
-                        )
+        self.proj_out = _maybe_quantised_linear(dim + self.mlp_hidden_dim, dim)
+
+        processor = (
+            FluxSingleAttnProcessor3_0() if _USE_FA3 else FluxAttnProcessor2_0()
+        )
         self.attn = Attention(
             query_dim=dim,
             cross_attention_dim=None,
@@ -235,6 +472,7 @@ class FluxSingleTransformerBlock(nn.Module):
             eps=1e-6,
             pre_only=True,
         )
+        _fuse_qk_norms(self.attn, attention_head_dim)
 
     def forward(
         self,
@@ -245,13 +483,15 @@ class FluxSingleTransformerBlock(nn.Module):
     ):
         residual = hidden_states
         norm_hidden_states, gate = self.norm(hidden_states, emb=temb)
-        mlp_hidden_states = self.act_mlp(self.proj_mlp(norm_hidden_states))
-
-        if attention_mask is not None:
-            attention_mask = expand_flux_attention_mask(
-                hidden_states,
-                attention_mask,
+        # exact-type check: quantised layers (e.g. bnb Linear8bitLt) subclass
+        # nn.Linear but need their own forward for scaling/casts.
+        if type(self.proj_mlp) is nn.Linear:
+            mlp_hidden_states = _mlp_gelu(
+                norm_hidden_states, self.proj_mlp.weight, self.proj_mlp.bias
             )
+        else:
+            # quantised layers need their own forward for scaling/casts
+            mlp_hidden_states = self.act_mlp(self.proj_mlp(norm_hidden_states))
 
         attn_output = self.attn(
             hidden_states=norm_hidden_states,
@@ -259,10 +499,19 @@ class FluxSingleTransformerBlock(nn.Module):
             attention_mask=attention_mask,
         )
 
-        hidden_states = torch.cat([attn_output, mlp_hidden_states], dim=2)
-        gate = gate.unsqueeze(1)
-        hidden_states = gate * self.proj_out(hidden_states)
-        hidden_states = residual + hidden_states
+        if type(self.proj_out) is nn.Linear:
+            # split the proj_out GEMM over its two input halves instead of
+            # materialising a (B, S, dim + mlp_hidden_dim) concat
+            dim = attn_output.shape[2]
+            weight = self.proj_out.weight
+            proj = F.linear(attn_output, weight[:, :dim]) + F.linear(
+                mlp_hidden_states, weight[:, dim:], self.proj_out.bias
+            )
+        else:
+            proj = self.proj_out(
+                torch.cat([attn_output, mlp_hidden_states], dim=2)
+            )
+        hidden_states = _gate_add(residual, gate, proj)
 
         return hidden_states
 
@@ -291,24 +540,11 @@ class FluxTransformerBlock(nn.Module):
 
         self.norm1_context = AdaLayerNormZero(dim)
 
-        if hasattr(F, "scaled_dot_product_attention"):
-            processor = FluxAttnProcessor2_0()
-            if torch.cuda.is_available():
-                rank = (
-                    torch.distributed.get_rank()
-                    if torch.distributed.is_initialized()
-                    else 0
-                )
-                primary_device = torch.cuda.get_device_properties(rank)
-                if primary_device.major == 9 and primary_device.minor == 0:
-                    if is_flash_attn_available:
-                        if rank == 0:
-                            print("Using FlashAttention3_0 for H100 GPU (Double block)")
-                        processor = FluxAttnProcessor3_0()
-        else:
+        if not hasattr(F, "scaled_dot_product_attention"):
             raise ValueError(
                 "The current PyTorch version does not support the `scaled_dot_product_attention` function."
             )
+        processor = FluxAttnProcessor3_0() if _USE_FA3 else FluxAttnProcessor2_0()
         self.attn = Attention(
             query_dim=dim,
             cross_attention_dim=None,
@@ -322,11 +558,13 @@ class FluxTransformerBlock(nn.Module):
             qk_norm=qk_norm,
             eps=eps,
         )
+        _fuse_qk_norms(self.attn, attention_head_dim, eps=eps)
 
-        self.norm2 = nn.LayerNorm(dim, elementwise_affine=False, eps=1e-6)
+        norm_cls = FusedLayerNorm if is_apex_available else nn.LayerNorm
+        self.norm2 = norm_cls(dim, elementwise_affine=False, eps=1e-6)
         self.ff = FeedForward(dim=dim, dim_out=dim, activation_fn="gelu-approximate")
 
-        self.norm2_context = nn.LayerNorm(dim, elementwise_affine=False, eps=1e-6)
+        self.norm2_context = norm_cls(dim, elementwise_affine=False, eps=1e-6)
         self.ff_context = FeedForward(
             dim=dim, dim_out=dim, activation_fn="gelu-approximate"
         )
@@ -351,12 +589,6 @@ class FluxTransformerBlock(nn.Module):
             self.norm1_context(encoder_hidden_states, emb=temb)
         )
 
-        if attention_mask is not None:
-            attention_mask = expand_flux_attention_mask(
-                torch.cat([encoder_hidden_states, hidden_states], dim=1),
-                attention_mask,
-            )
-
         # Attention.
         attn_output, context_attn_output = self.attn(
             hidden_states=norm_hidden_states,
@@ -366,33 +598,28 @@ class FluxTransformerBlock(nn.Module):
         )
 
         # Process attention outputs for the `hidden_states`.
-        attn_output = gate_msa.unsqueeze(1) * attn_output
-        hidden_states = hidden_states + attn_output
+        hidden_states = _gate_add(hidden_states, gate_msa, attn_output)
 
-        norm_hidden_states = self.norm2(hidden_states)
-        norm_hidden_states = (
-            norm_hidden_states * (1 + scale_mlp[:, None]) + shift_mlp[:, None]
+        norm_hidden_states = _modulate(
+            self.norm2(hidden_states), scale_mlp, shift_mlp
         )
 
         ff_output = self.ff(norm_hidden_states)
-        ff_output = gate_mlp.unsqueeze(1) * ff_output
-
-        hidden_states = hidden_states + ff_output
+        hidden_states = _gate_add(hidden_states, gate_mlp, ff_output)
 
         # Process attention outputs for the `encoder_hidden_states`.
 
-        context_attn_output = c_gate_msa.unsqueeze(1) * context_attn_output
-        encoder_hidden_states = encoder_hidden_states + context_attn_output
+        encoder_hidden_states = _gate_add(
+            encoder_hidden_states, c_gate_msa, context_attn_output
+        )
 
-        norm_encoder_hidden_states = self.norm2_context(encoder_hidden_states)
-        norm_encoder_hidden_states = (
-            norm_encoder_hidden_states * (1 + c_scale_mlp[:, None])
-            + c_shift_mlp[:, None]
+        norm_encoder_hidden_states = _modulate(
+            self.norm2_context(encoder_hidden_states), c_scale_mlp, c_shift_mlp
         )
 
         context_ff_output = self.ff_context(norm_encoder_hidden_states)
-        encoder_hidden_states = (
-            encoder_hidden_states + c_gate_mlp.unsqueeze(1) * context_ff_output
+        encoder_hidden_states = _gate_add(
+            encoder_hidden_states, c_gate_mlp, context_ff_output
         )
 
         return encoder_hidden_states, hidden_states
@@ -478,6 +705,28 @@ class FluxTransformer2DModelWithMasking(
             ]
         )
 
+        compile_blocks = (
+            os.environ.get("SIMPLETUNER_COMPILE_BLOCKS", "false").lower() == "true"
+        )
+        cuda_graphs = (
+            os.environ.get("SIMPLETUNER_CUDA_GRAPHS", "false").lower() == "true"
+        )
+        if compile_blocks or cuda_graphs:
+            # Compile each block body so Inductor can vertically fuse the
+            # AdaLN affine, attention epilogue, GELU and gating kernels.
+            # SIMPLETUNER_CUDA_GRAPHS additionally captures each block under
+            # CUDA graphs (reduce-overhead) to amortise kernel launches; that
+            # requires every step to use identical shapes.
+            # Inputs should be bucketed to a fixed shape to avoid recompiles.
+            # Module.compile() keeps the blocks in place so the state-dict
+            # keys stay transformer_blocks.N.* and checkpoints remain
+            # interchangeable with uncompiled processes.
+            compile_mode = "reduce-overhead" if cuda_graphs else "max-autotune"
+            for block in self.transformer_blocks:
+                block.compile(mode=compile_mode, fullgraph=False)
+            for block in self.single_transformer_blocks:
+                block.compile(mode=compile_mode, fullgraph=False)
+
         self.norm_out = AdaLayerNormContinuous(
             self.inner_dim, self.inner_dim, elementwise_affine=False, eps=1e-6
         )
@@ -488,6 +737,9 @@ class FluxTransformer2DModelWithMasking(
         self.gradient_checkpointing = False
         # added for users to disable checkpointing every nth step
         self.gradient_checkpointing_interval = None
+        # rotary embeddings only depend on the position ids, which are fixed
+        # for a given resolution + text length; cache them across steps.
+        self._rotary_emb_cache = {}
 
     def _set_gradient_checkpointing(self, module, value=False):
         if hasattr(module, "gradient_checkpointing"):
@@ -496,6 +748,22 @@ class FluxTransformer2DModelWithMasking(
     def set_gradient_checkpointing_interval(self, value: int):
         self.gradient_checkpointing_interval = value
 
+    def fuse_qkv_projections(self):
+        """
+        Fuse each Attention's q/k/v (and added q/k/v) Linears into a single
+        projection so every block issues one GEMM instead of three. Call this
+        after loading weights; the processors pick up the fused path
+        automatically.
+
+        Per-block fusion is as far as GEMM grouping can go here: each block's
+        projections consume the previous block's output, so stacking weights
+        across blocks into one batched GEMM is not possible. Launch overhead
+        across blocks is instead addressed by SIMPLETUNER_CUDA_GRAPHS.
+        """
+        for module in self.modules():
+            if isinstance(module, Attention):
+                module.fuse_projections(fuse=True)
+
     def forward(
         self,
         hidden_states: torch.Tensor,
@@ -565,15 +833,62 @@ class FluxTransformer2DModelWithMasking(
             else self.time_text_embed(timestep, guidance, pooled_projections)
         )
         encoder_hidden_states = self.context_embedder(encoder_hidden_states)
+        txt_seq_len = encoder_hidden_states.shape[1]
 
         if txt_ids.ndim == 3:
             txt_ids = txt_ids[0]
         if img_ids.ndim == 3:
             img_ids = img_ids[0]
 
-        ids = torch.cat((txt_ids, img_ids), dim=0)
+        # embeds built under torch.inference_mode() are inference tensors and
+        # cannot be saved for backward, so validation bypasses the cache
+        # rather than poisoning it for the grad-enabled training forwards.
+        use_rope_cache = not torch.is_inference_mode_enabled()
+        image_rotary_emb = None
+        if use_rope_cache:
+            rope_key = (txt_ids.shape, img_ids.shape)
+            # transposed aspect buckets (e.g. 512x768 vs 768x512) share a
+            # shape but carry different position grids, and the allocator
+            # recycles addresses across steps, so entries are verified by
+            # content — never by data_ptr.
+            for cached_txt_ids, cached_img_ids, cached_emb in (
+                self._rotary_emb_cache.get(rope_key, ())
+            ):
+                if torch.equal(cached_txt_ids, txt_ids) and torch.equal(
+                    cached_img_ids, img_ids
+                ):
+                    image_rotary_emb = cached_emb
+                    break
+        if image_rotary_emb is None:
+            ids = torch.cat((txt_ids, img_ids), dim=0)
+            image_rotary_emb = self.pos_embed(ids)
+            if use_rope_cache:
+                if (
+                    sum(len(entries) for entries in self._rotary_emb_cache.values())
+                    >= 16
+                ):
+                    # aspect-bucketed training cycles a handful of resolutions;
+                    # anything past that is churn, so just reset.
+                    self._rotary_emb_cache.clear()
+                # the ids are cloned because callers rebuild them into
+                # recycled buffers every step.
+                self._rotary_emb_cache.setdefault(rope_key, []).append(
+                    (txt_ids.clone(), img_ids.clone(), image_rotary_emb)
+                )
 
-        image_rotary_emb = self.pos_embed(ids)
+        if attention_mask is not None:
+            # callers drop all-valid masks before the forward (the collate
+            # pass decides it from mask contents off the hot path); checking
+            # .all() here would force a GPU->host sync every step.
+            # The expanded mask is identical for every block, so build it once
+            # here for the full txt+img sequence instead of per-block.
+            attention_mask = expand_flux_attention_mask(
+                txt_seq_len + hidden_states.shape[1],
+                attention_mask.to(hidden_states.device),
+            )
+            # pre-shape to (B, 1, 1, S) once so the 57 attention calls don't
+            # each repeat the cast/unsqueeze
+            attention_mask = attention_mask.unsqueeze(1).unsqueeze(2)
 
         for index_block, block in enumerate(self.transformer_blocks):
             if (
@@ -585,27 +900,16 @@ class FluxTransformer2DModelWithMasking(
                 )
             ):
 
-                def create_custom_forward(module, return_dict=None):
-                    def custom_forward(*inputs):
-                        if return_dict is not None:
-                            return module(*inputs, return_dict=return_dict)
-                        else:
-                            return module(*inputs)
-
-                    return custom_forward
-
-                ckpt_kwargs: Dict[str, Any] = (
-                    {"use_reentrant": False} if is_torch_version(">=", "1.11.0") else {}
-                )
                 encoder_hidden_states, hidden_states = (
                     torch.utils.checkpoint.checkpoint(
-                        create_custom_forward(block),
+                        _checkpoint_call,
+                        block,
                         hidden_states,
                         encoder_hidden_states,
                         temb,
                         image_rotary_emb,
                         attention_mask,
-                        **ckpt_kwargs,
+                        **_CKPT_KWARGS,
                     )
                 )
 
@@ -626,31 +930,20 @@ class FluxTransformer2DModelWithMasking(
             if (
                 self.training
                 and self.gradient_checkpointing
-                or (
-                    self.gradient_checkpointing_interval is not None
-                    and index_block % self.gradient_checkpointing_interval == 0
+                and (
+                    self.gradient_checkpointing_interval is None
+                    or index_block % self.gradient_checkpointing_interval == 0
                 )
             ):
 
-                def create_custom_forward(module, return_dict=None):
-                    def custom_forward(*inputs):
-                        if return_dict is not None:
-                            return module(*inputs, return_dict=return_dict)
-                        else:
-                            return module(*inputs)
-
-                    return custom_forward
-
-                ckpt_kwargs: Dict[str, Any] = (
-                    {"use_reentrant": False} if is_torch_version(">=", "1.11.0") else {}
-                )
                 hidden_states = torch.utils.checkpoint.checkpoint(
-                    create_custom_forward(block),
+                    _checkpoint_call,
+                    block,
                     hidden_states,
                     temb,
                     image_rotary_emb,
                     attention_mask,
-                    **ckpt_kwargs,
+                    **_CKPT_KWARGS,
                 )
 
             else:
@@ -661,7 +954,7 @@ class FluxTransformer2DModelWithMasking(
                     attention_mask=attention_mask,
                 )
 
-        hidden_states = hidden_states[:, encoder_hidden_states.shape[1] :, ...]
+        hidden_states = hidden_states[:, txt_seq_len:, ...]
 
         hidden_states = self.norm_out(hidden_states, temb)
         output = self.proj_out(hidden_states)
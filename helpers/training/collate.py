@@ -527,12 +527,18 @@ def collate_fn(batch):
     ]
 
     attn_mask = None
+    attn_mask_is_full = None
     batch_time_ids = None
     if StateTracker.get_model_family() == "flux":
         debug_log("Compute and stack Flux time ids")
         prompt_embeds_all, add_text_embeds_all, batch_time_ids, attn_mask = (
             compute_prompt_embeddings(captions, text_embed_cache)
         )
+        if attn_mask is not None:
+            # decided here, off the training hot path, so the transformer
+            # forward never has to sync on mask contents to spot the
+            # all-tokens-valid no-op case.
+            attn_mask_is_full = bool(attn_mask.all())
     else:
         prompt_embeds_all, add_text_embeds_all = compute_prompt_embeddings(
             captions, text_embed_cache
@@ -564,6 +570,7 @@ def collate_fn(batch):
         "batch_luminance": batch_luminance,
         "conditioning_pixel_values": conditioning_pixel_values,
         "encoder_attention_mask": attn_mask,
+        "encoder_attention_mask_is_full": attn_mask_is_full,
         "is_regularisation_data": is_regularisation_data,
         "conditioning_type": conditioning_type,
     }
@@ -105,6 +105,9 @@ class EMAModel:
             self.to(device=kwargs["device"])
 
         self.temp_stored_params = None
+        # pinned host staging buffers for store()/restore(), allocated lazily
+        # and reused across validation cycles.
+        self._store_buffers = None
 
         self.decay = decay
         self.min_decay = min_decay
@@ -322,7 +325,11 @@ class EMAModel:
                         )
                     else:
                         s_param.copy_(param)
-        if self.args.ema_device == "cpu" and not self.args.ema_cpu_only:
+        if (
+            self.args.ema_device == "cpu"
+            and not self.args.ema_cpu_only
+            and not getattr(self.args, "ema_keep_on_device", False)
+        ):
             # Move back to CPU for safe-keeping.
             self.to(device=self.args.ema_device, non_blocking=True)
 
@@ -397,11 +404,43 @@ class EMAModel:
             )
         return state_dict
 
+    @torch.no_grad()
     def store(self, parameters: Iterable[torch.nn.Parameter]) -> None:
         r"""
         Save the current parameters for restoring later.
+
+        The staging buffers live in pinned host memory and are allocated once,
+        so repeated store/restore cycles reuse them and the device-to-host copy
+        stays asynchronous with respect to the current CUDA stream.
         """
-        self.temp_stored_params = [param.detach().cpu().clone() for param in parameters]
+        parameters = list(parameters)
+        pin = torch.cuda.is_available() and not torch.backends.mps.is_available()
+        if (
+            self._store_buffers is None
+            or len(self._store_buffers) != len(parameters)
+            or any(
+                buffer.shape != param.shape
+                for buffer, param in zip(self._store_buffers, parameters)
+            )
+        ):
+            self._store_buffers = [
+                torch.empty(
+                    param.shape, dtype=param.dtype, device="cpu", pin_memory=pin
+                )
+                for param in parameters
+            ]
+        if self.foreach:
+            # one fused launch per device/dtype group instead of a Python
+            # loop issuing a copy per tensor.
+            torch._foreach_copy_(
+                self._store_buffers,
+                [param.detach() for param in parameters],
+                non_blocking=True,
+            )
+        else:
+            for buffer, param in zip(self._store_buffers, parameters):
+                buffer.copy_(param.detach(), non_blocking=True)
+        self.temp_stored_params = self._store_buffers
 
     def restore(self, parameters: Iterable[torch.nn.Parameter]) -> None:
         r"""
@@ -421,7 +460,8 @@ class EMAModel:
             for c_param, param in zip(self.temp_stored_params, parameters):
                 param.data.copy_(c_param.data)
 
-        # Better memory-wise.
+        # Drop the reference; the pinned staging buffers stay allocated for
+        # the next store() call.
         self.temp_stored_params = None
 
     def parameter_count(self) -> int:
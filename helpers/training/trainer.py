@@ -2140,6 +2140,11 @@ class Trainer:
                         raise ValueError(
                             "No attention mask was discovered when attempting validation - this means you need to recreate your text embed cache."
                         )
+                    if batch.get("encoder_attention_mask_is_full"):
+                        # every token is valid, so masking is a semantic
+                        # no-op; drop it here (the collate pass made the
+                        # call) and take the unmasked attention path.
+                        flux_transformer_kwargs["attention_mask"] = None
 
                 model_pred = self.transformer(**flux_transformer_kwargs)[0]
 
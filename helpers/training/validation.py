@@ -1,66 +1,234 @@
 import torch
 import diffusers
+import gc
 import os
 import wandb
 import logging
 import sys
 import numpy as np
+import functools
+import hashlib
+import importlib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from tqdm import tqdm
 from helpers.training.wrappers import unwrap_model
 from PIL import Image
 from helpers.training.state_tracker import StateTracker
-from helpers.models.sdxl.pipeline import (
-    StableDiffusionXLPipeline,
-    StableDiffusionXLImg2ImgPipeline,
-)
-from helpers.legacy.pipeline import StableDiffusionPipeline
-from diffusers.schedulers import (
-    EulerDiscreteScheduler,
-    EulerAncestralDiscreteScheduler,
-    FlowMatchEulerDiscreteScheduler,
-    UniPCMultistepScheduler,
-    DDIMScheduler,
-    DDPMScheduler,
-)
 from diffusers.utils.torch_utils import is_compiled_module
 from helpers.multiaspect.image import MultiaspectImage
-from helpers.image_manipulation.brightness import calculate_luminance
+from helpers.image_manipulation.brightness import calculate_image_set_luminance
 from PIL import Image, ImageDraw, ImageFont
-from diffusers import SanaPipeline
 
 logger = logging.getLogger(__name__)
 logger.setLevel(os.environ.get("SIMPLETUNER_LOG_LEVEL") or "INFO")
 
-try:
-    from helpers.models.sd3.pipeline import (
-        StableDiffusion3Pipeline,
-        StableDiffusion3Img2ImgPipeline,
-    )
-except ImportError:
-    logger.error(
-        "Stable Diffusion 3 not available in this release of Diffusers. Please upgrade."
-    )
-    raise ImportError()
+# model families grouped by the embed layout their text encoders produce
+_POOLED_EMBED_FAMILIES = frozenset({"sdxl", "sd3", "kolors", "flux"})
+_UNPOOLED_EMBED_FAMILIES = frozenset({"legacy", "pixart_sigma", "smoldit", "sana"})
+_MASKED_EMBED_FAMILIES = frozenset({"pixart_sigma", "smoldit", "sana"})
+
+
+def _unpack_pooled_embeds(_embed):
+    # (embeds, pooled[, time_ids[, mask]]) -> fixed four-tuple.
+    if not 2 <= len(_embed) <= 4:
+        raise ValueError(
+            f"Unexpected number of embeddings returned from cache: {_embed}"
+        )
+    return tuple(_embed) + (None,) * (4 - len(_embed))
+
+
+def _unpack_prompt_embeds(_embed):
+    return (_embed[0], None, None, None)
+
+
+def _unpack_masked_embeds(_embed):
+    prompt_embeds, prompt_mask = _embed
+    return (prompt_embeds[0], None, None, prompt_mask)
+
+
+# family -> callable returning (prompt_embeds, pooled_embeds, time_ids, mask),
+# with None for the slots a family does not produce. Keeps the per-prompt path
+# free of len()-based unpacking.
+_EMBED_UNPACKERS = {
+    **{family: _unpack_pooled_embeds for family in _POOLED_EMBED_FAMILIES},
+    **{
+        family: _unpack_prompt_embeds
+        for family in _UNPOOLED_EMBED_FAMILIES - _MASKED_EMBED_FAMILIES
+    },
+    **{family: _unpack_masked_embeds for family in _MASKED_EMBED_FAMILIES},
+}
 
 SCHEDULER_NAME_MAP = {
-    "euler": EulerDiscreteScheduler,
-    "euler-a": EulerAncestralDiscreteScheduler,
-    "flow-match": FlowMatchEulerDiscreteScheduler,
-    "unipc": UniPCMultistepScheduler,
-    "ddim": DDIMScheduler,
-    "ddpm": DDPMScheduler,
-    "sana": FlowMatchEulerDiscreteScheduler,
+    "euler": "EulerDiscreteScheduler",
+    "euler-a": "EulerAncestralDiscreteScheduler",
+    "flow-match": "FlowMatchEulerDiscreteScheduler",
+    "unipc": "UniPCMultistepScheduler",
+    "ddim": "DDIMScheduler",
+    "ddpm": "DDPMScheduler",
+    "sana": "FlowMatchEulerDiscreteScheduler",
 }
 
+
+@functools.lru_cache(maxsize=None)
+def _get_scheduler_cls(scheduler_name: str):
+    # only pull in the scheduler a run actually asks for.
+    import diffusers.schedulers
+
+    return getattr(diffusers.schedulers, SCHEDULER_NAME_MAP[scheduler_name])
+
+
+@functools.lru_cache(maxsize=4)
+def _stitch_font(size: int = 36):
+    # loading a truetype font hits the disk; do it once per size.
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except IOError:
+        return ImageFont.load_default()
+
+
+def _imp(module_path: str, class_name: str):
+    return getattr(importlib.import_module(module_path), class_name)
+
+
+def _unsupported(exc_cls, message: str):
+    def _raise():
+        raise exc_cls(message)
+
+    return _raise
+
+
+# (family, controlnet, img2img) -> zero-arg loader returning the pipeline
+# class, or raising for unsupported combinations. Loaders import lazily so
+# only the requested family's module graph is ever pulled in.
+_PIPELINE_REGISTRY = {}
+
+
+def _register_pipeline(family, loader, controlnet=(False, True), img2img=(False, True)):
+    for use_controlnet in controlnet:
+        for use_img2img in img2img:
+            _PIPELINE_REGISTRY[(family, use_controlnet, use_img2img)] = loader
+
+
+_register_pipeline(
+    "sdxl",
+    lambda: _imp("diffusers.pipelines", "StableDiffusionXLControlNetPipeline"),
+    controlnet=(True,),
+)
+_register_pipeline(
+    "sdxl",
+    lambda: _imp("helpers.models.sdxl.pipeline", "StableDiffusionXLImg2ImgPipeline"),
+    controlnet=(False,),
+    img2img=(True,),
+)
+_register_pipeline(
+    "sdxl",
+    lambda: _imp("helpers.models.sdxl.pipeline", "StableDiffusionXLPipeline"),
+    controlnet=(False,),
+    img2img=(False,),
+)
+_register_pipeline(
+    "flux",
+    _unsupported(NotImplementedError, "Flux ControlNet is not yet supported."),
+    controlnet=(True,),
+)
+_register_pipeline(
+    "flux",
+    _unsupported(
+        NotImplementedError,
+        "Flux inference validation using img2img is not yet supported."
+        " Please remove --validation_using_datasets.",
+    ),
+    controlnet=(False,),
+    img2img=(True,),
+)
+_register_pipeline(
+    "flux",
+    lambda: _imp("helpers.models.flux", "FluxPipeline"),
+    controlnet=(False,),
+    img2img=(False,),
+)
+_register_pipeline(
+    "kolors",
+    _unsupported(NotImplementedError, "Kolors ControlNet is not yet supported."),
+    controlnet=(True,),
+)
+_register_pipeline(
+    "kolors",
+    lambda: _imp("helpers.kolors.pipeline", "KolorsImg2ImgPipeline"),
+    controlnet=(False,),
+    img2img=(True,),
+)
+_register_pipeline(
+    "kolors",
+    lambda: _imp("helpers.kolors.pipeline", "KolorsPipeline"),
+    controlnet=(False,),
+    img2img=(False,),
+)
+_register_pipeline(
+    "legacy", lambda: _imp("helpers.legacy.pipeline", "StableDiffusionPipeline")
+)
+_register_pipeline(
+    "sd3",
+    _unsupported(Exception, "SD3 ControlNet is not yet supported."),
+    controlnet=(True,),
+)
+_register_pipeline(
+    "sd3",
+    lambda: _imp("helpers.models.sd3.pipeline", "StableDiffusion3Img2ImgPipeline"),
+    controlnet=(False,),
+    img2img=(True,),
+)
+_register_pipeline(
+    "sd3",
+    lambda: _imp("helpers.models.sd3.pipeline", "StableDiffusion3Pipeline"),
+    controlnet=(False,),
+    img2img=(False,),
+)
+_register_pipeline(
+    "pixart_sigma",
+    _unsupported(
+        Exception, "PixArt Sigma ControlNet inference validation is not yet supported."
+    ),
+    controlnet=(True,),
+)
+_register_pipeline(
+    "pixart_sigma",
+    _unsupported(
+        Exception,
+        "PixArt Sigma inference validation using img2img is not yet supported."
+        " Please remove --validation_using_datasets.",
+    ),
+    controlnet=(False,),
+    img2img=(True,),
+)
+_register_pipeline(
+    "pixart_sigma",
+    lambda: _imp("helpers.models.pixart.pipeline", "PixArtSigmaPipeline"),
+    controlnet=(False,),
+    img2img=(False,),
+)
+_register_pipeline("smoldit", lambda: _imp("helpers.models.smoldit", "SmolDiTPipeline"))
+_register_pipeline("sana", lambda: _imp("diffusers", "SanaPipeline"))
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_pipeline_cls(model_family: str, controlnet: bool, img2img: bool):
+    loader = _PIPELINE_REGISTRY.get((model_family, controlnet, img2img))
+    if loader is None:
+        raise NotImplementedError(
+            f"Model type {model_family} not implemented for validation."
+        )
+    return loader()
+
+
 import logging
 import os
 import time
 from diffusers.utils import is_wandb_available
 from helpers.prompts import PromptHandler
-from diffusers import (
-    AutoencoderKL,
-    DDIMScheduler,
-)
 
 if is_wandb_available():
     import wandb
@@ -72,8 +240,7 @@ logger.setLevel(os.environ.get("SIMPLETUNER_LOG_LEVEL") or "INFO")
 
 def resize_validation_images(validation_images, edge_length):
     # we have to scale all the inputs to a stage4 image down to 64px smaller edge.
-    resized_validation_samples = []
-    for _sample in validation_images:
+    def _resize_one(_sample):
         validation_shortname, validation_prompt, training_sample_image = _sample
         resize_to, crop_to, new_aspect_ratio = (
             MultiaspectImage.calculate_new_size_by_pixel_edge(
@@ -84,12 +251,18 @@ def resize_validation_images(validation_images, edge_length):
                 original_size=training_sample_image.size,
             )
         )
-        # we can be less precise here
-        training_sample_image = training_sample_image.resize(crop_to)
-        resized_validation_samples.append(
-            (validation_shortname, validation_prompt, training_sample_image)
-        )
-    return resized_validation_samples
+        # Lanczos is the correct filter for downscaling; Pillow releases the
+        # GIL during resampling, so the thread pool genuinely overlaps work
+        # (and pillow-simd vectorises it when installed).
+        training_sample_image = training_sample_image.resize(crop_to, Image.LANCZOS)
+        return (validation_shortname, validation_prompt, training_sample_image)
+
+    if not validation_images:
+        return []
+    with ThreadPoolExecutor(
+        max_workers=min(8, len(validation_images))
+    ) as resize_pool:
+        return list(resize_pool.map(_resize_one, validation_images))
 
 
 def retrieve_validation_images():
@@ -105,18 +278,27 @@ def retrieve_validation_images():
         _type="conditioning" if args.controlnet else "image"
     )
     validation_data_backend_id = args.eval_dataset_id
+    if validation_data_backend_id is not None:
+        # only one backend can match the id filter below; look it up directly
+        # rather than iterating (and logging) every other backend.
+        data_backends = (
+            {validation_data_backend_id: data_backends[validation_data_backend_id]}
+            if validation_data_backend_id in data_backends
+            else {}
+        )
     validation_set = []
     logger.info("Collecting validation images")
     for _data_backend in data_backends:
         data_backend = StateTracker.get_data_backend(_data_backend)
         data_backend_config = data_backend.get("config", {})
         should_skip_dataset = data_backend_config.get("disable_validation", False)
+        dataset_type = data_backend.get("dataset_type", None)
         logger.debug(f"Backend {_data_backend}: {data_backend}")
         if "id" not in data_backend or (
-            args.controlnet and data_backend.get("dataset_type", None) != "conditioning"
+            args.controlnet and dataset_type != "conditioning"
         ):
             logger.debug(
-                f"Skipping data backend: {_data_backend} dataset_type {data_backend.get('dataset_type', None)}"
+                f"Skipping data backend: {_data_backend} dataset_type {dataset_type}"
             )
             continue
         logger.debug(f"Checking data backend: {data_backend['id']}")
@@ -143,6 +325,11 @@ def retrieve_validation_images():
     return validation_set
 
 
+def _chunks(seq, size):
+    for i in range(0, len(seq), size):
+        yield seq[i : i + size]
+
+
 def prepare_validation_prompt_list(args, embed_cache):
     validation_negative_prompt_embeds = None
     validation_negative_pooled_embeds = None
@@ -160,6 +347,7 @@ def prepare_validation_prompt_list(args, embed_cache):
         )
     model_type = embed_cache.model_type
     validation_sample_images = None
+    image_prompts = []
     if (
         "deepfloyd-stage2" in args.model_type
         or args.controlnet
@@ -170,55 +358,56 @@ def prepare_validation_prompt_list(args, embed_cache):
         validation_sample_images = retrieve_validation_images()
         if len(validation_sample_images) > 0:
             StateTracker.set_validation_sample_images(validation_sample_images)
-            # Collect the prompts for the validation images.
-            for _validation_sample in tqdm(
-                validation_sample_images,
-                ncols=100,
-                desc="Precomputing validation image embeds",
-            ):
-                _, validation_prompt, _ = _validation_sample
-                embed_cache.compute_embeddings_for_prompts(
-                    [validation_prompt], load_from_cache=False
-                )
-            time.sleep(5)
+            image_prompts = [
+                validation_prompt
+                for _, validation_prompt, _ in validation_sample_images
+            ]
 
+    pending_prompts = []
     if args.validation_prompt_library:
         # Use the SimpleTuner prompts library for validation prompts.
         from helpers.prompts import prompts as prompt_library
 
-        # Iterate through the prompts with a progress bar
-        for shortname, prompt in tqdm(
-            prompt_library.items(),
-            leave=False,
-            ncols=100,
-            desc="Precomputing validation prompt embeddings",
-        ):
-            embed_cache.compute_embeddings_for_prompts(
-                [prompt], is_validation=True, load_from_cache=False
-            )
+        for shortname, prompt in prompt_library.items():
+            pending_prompts.append(prompt)
             validation_prompts.append(prompt)
             validation_shortnames.append(shortname)
     if args.user_prompt_library is not None:
         user_prompt_library = PromptHandler.load_user_prompts(args.user_prompt_library)
-        for shortname, prompt in tqdm(
-            user_prompt_library.items(),
-            leave=False,
-            ncols=100,
-            desc="Precomputing user prompt library embeddings",
-        ):
-            embed_cache.compute_embeddings_for_prompts(
-                [prompt], is_validation=True, load_from_cache=False
-            )
+        for shortname, prompt in user_prompt_library.items():
+            pending_prompts.append(prompt)
             validation_prompts.append(prompt)
             validation_shortnames.append(shortname)
     if args.validation_prompt is not None:
         # Use a single prompt for validation.
         # This will add a single prompt to the prompt library, if in use.
-        validation_prompts = validation_prompts + [args.validation_prompt]
-        validation_shortnames = validation_shortnames + ["validation"]
-        embed_cache.compute_embeddings_for_prompts(
-            [args.validation_prompt], is_validation=True, load_from_cache=False
-        )
+        pending_prompts.append(args.validation_prompt)
+        validation_prompts.append(args.validation_prompt)
+        validation_shortnames.append("validation")
+    # one aggregate bar for all embed precomputation; batched updates keep the
+    # stderr writes to a handful rather than one per prompt.
+    embed_batches = [
+        (prompt_chunk, {"load_from_cache": False})
+        for prompt_chunk in _chunks(image_prompts, 16)
+    ]
+    embed_batches.extend(
+        (prompt_chunk, {"is_validation": True, "load_from_cache": False})
+        for prompt_chunk in _chunks(pending_prompts, 16)
+    )
+    if embed_batches:
+        with tqdm(
+            total=len(image_prompts) + len(pending_prompts),
+            ncols=100,
+            desc="Precomputing validation prompt embeds",
+            mininterval=1.0,
+        ) as pbar:
+            for prompt_chunk, embed_kwargs in embed_batches:
+                embed_cache.compute_embeddings_for_prompts(
+                    prompt_chunk, **embed_kwargs
+                )
+                pbar.update(len(prompt_chunk))
+        if torch.cuda.is_available():
+            torch.cuda.synchronize()
 
     # Compute negative embed for validation prompts, if any are set.
     if validation_prompts:
@@ -291,30 +480,20 @@ def prepare_validation_prompt_list(args, embed_cache):
             raise ValueError(f"Unknown model type '{model_type}'")
 
 
-def parse_validation_resolution(input_str: str) -> tuple:
+@functools.lru_cache(maxsize=32)
+def parse_validation_resolution(input_str) -> tuple:
     """
     If the args.validation_resolution:
      - is an int, we'll treat it as height and width square aspect
      - if it has an x in it, we will split and treat as WIDTHxHEIGHT
-     - if it has comma, we will split and treat each value as above
+
+    Pure and memoised; the DeepFloyd stage 2 minimum-size check lives in
+    get_validation_resolutions so repeated parses stay cache hits.
     """
     if isinstance(input_str, int) or input_str.isdigit():
-        if (
-            "deepfloyd-stage2" in StateTracker.get_args().model_type
-            and int(input_str) < 256
-        ):
-            raise ValueError(
-                "Cannot use less than 256 resolution for DeepFloyd stage 2."
-            )
-        return (input_str, input_str)
+        return (int(input_str), int(input_str))
     if "x" in input_str:
         pieces = input_str.split("x")
-        if "deepfloyd-stage2" in StateTracker.get_args().model_type and (
-            int(pieces[0]) < 256 or int(pieces[1]) < 256
-        ):
-            raise ValueError(
-                "Cannot use less than 256 resolution for DeepFloyd stage 2."
-            )
         return (int(pieces[0]), int(pieces[1]))
 
 
@@ -330,55 +509,19 @@ def get_validation_resolutions():
         type(validation_resolution_parameter) is str
         and "," in validation_resolution_parameter
     ):
-        return [
+        resolutions = [
             parse_validation_resolution(res)
             for res in validation_resolution_parameter.split(",")
         ]
-    return [parse_validation_resolution(validation_resolution_parameter)]
-
-
-def get_validation_resolutions():
-    """
-    If the args.validation_resolution:
-     - is an int, we'll treat it as height and width square aspect
-     - if it has an x in it, we will split and treat as WIDTHxHEIGHT
-     - if it has comma, we will split and treat each value as above
-    """
-    validation_resolution_parameter = StateTracker.get_args().validation_resolution
-    if (
-        type(validation_resolution_parameter) is str
-        and "," in validation_resolution_parameter
-    ):
-        return [
-            parse_validation_resolution(res)
-            for res in validation_resolution_parameter.split(",")
-        ]
-    return [parse_validation_resolution(validation_resolution_parameter)]
-
-
-def parse_validation_resolution(input_str: str) -> tuple:
-    """
-    If the args.validation_resolution:
-     - is an int, we'll treat it as height and width square aspect
-     - if it has an x in it, we will split and treat as WIDTHxHEIGHT
-     - if it has comma, we will split and treat each value as above
-    """
-    is_df_ii = (
-        True if "deepfloyd-stage2" in StateTracker.get_args().model_type else False
-    )
-    if isinstance(input_str, int) or input_str.isdigit():
-        if is_df_ii and int(input_str) < 256:
-            raise ValueError(
-                "Cannot use less than 256 resolution for DeepFloyd stage 2."
-            )
-        return (input_str, input_str)
-    if "x" in input_str:
-        pieces = input_str.split("x")
-        if is_df_ii and (int(pieces[0]) < 256 or int(pieces[1]) < 256):
-            raise ValueError(
-                "Cannot use less than 256 resolution for DeepFloyd stage 2."
-            )
-        return (int(pieces[0]), int(pieces[1]))
+    else:
+        resolutions = [parse_validation_resolution(validation_resolution_parameter)]
+    if "deepfloyd-stage2" in StateTracker.get_args().model_type:
+        for resolution in resolutions:
+            if resolution is not None and min(resolution) < 256:
+                raise ValueError(
+                    "Cannot use less than 256 resolution for DeepFloyd stage 2."
+                )
+    return resolutions
 
 
 class Validation:
@@ -416,8 +559,7 @@ class Validation:
         self.controlnet = controlnet
         self.args = args
         self.save_dir = os.path.join(args.output_dir, "validation_images")
-        if not os.path.exists(self.save_dir):
-            os.makedirs(self.save_dir, exist_ok=True)
+        os.makedirs(self.save_dir, exist_ok=True)
         self.global_step = None
         self.global_resume_step = None
         self.text_encoder_1 = text_encoder_1
@@ -432,14 +574,16 @@ class Validation:
         self.embed_cache = embed_cache
         self.validation_negative_prompt_mask = None
         self.validation_negative_pooled_embeds = validation_negative_pooled_embeds
-        self.validation_negative_prompt_embeds = (
-            validation_negative_prompt_embeds
-            if (
-                type(validation_negative_prompt_embeds) is not list
-                and type(validation_negative_prompt_embeds) is not tuple
-            )
-            else validation_negative_prompt_embeds[0]
-        )
+        # normalise once here so the per-prompt path only ever sees tensors.
+        if isinstance(validation_negative_prompt_embeds, (list, tuple)):
+            validation_negative_prompt_embeds = validation_negative_prompt_embeds[0]
+        if isinstance(validation_negative_prompt_embeds, (list, tuple)):
+            # masked families cache the negative as an (embeds, mask) pair.
+            (
+                validation_negative_prompt_embeds,
+                self.validation_negative_prompt_mask,
+            ) = validation_negative_prompt_embeds[0]
+        self.validation_negative_prompt_embeds = validation_negative_prompt_embeds
         self.ema_model = ema_model
         self.ema_enabled = False
         self.vae = vae
@@ -452,6 +596,14 @@ class Validation:
         self.validation_resolutions = (
             get_validation_resolutions() if not self.deepfloyd_stage2 else ["base-256"]
         )
+        # pure functions of args; resolve the label strings once instead of
+        # reformatting them on every save/logging call.
+        self._resolution_labels = [
+            self._res_to_label(res) for res in self.validation_resolutions
+        ]
+        self._resolution_strings = [
+            f"{res[0]}x{res[1]}" for res in get_validation_resolutions()
+        ]
         self.text_encoder_3 = text_encoder_3
         self.tokenizer_3 = tokenizer_3
         self.flow_matching = (
@@ -475,8 +627,124 @@ class Validation:
         self.model_evaluator = model_evaluator
         if self.model_evaluator is not None:
             logger.info(f"Using model evaluator: {self.model_evaluator}")
+        # hot-path copies for would_validate, which runs every training step.
+        self._grad_accum = self.args.gradient_accumulation_steps
+        self._val_steps = self.args.validation_steps
         self._update_state()
         self.eval_scores = {}
+        self._in_validation_context = False
+        self._generator = None
+        self._prompt_embed_cache = {}
+        self._transfer_stream = (
+            torch.cuda.Stream() if torch.cuda.is_available() else None
+        )
+        # PIL releases the GIL around libpng, so benchmark encodes can
+        # proceed while the next validation generates.
+        self._save_pool = ThreadPoolExecutor(max_workers=4)
+        self._save_futures = []
+        self._ensured_dirs = set()
+        self._webhook_queue = None
+        self._webhook_thread = None
+        self._compiled_unet = None
+        self._compiled_transformer = None
+        self._compiled_controlnet = None
+        self._channels_last_applied = False
+        self._benchmark_dir_exists = None
+        self._pipeline_on_device = False
+        self._auxiliaries_offloaded = False
+        if (
+            getattr(self.args, "validation_downcast_text_encoders", False)
+            and not self.deepspeed
+            # the encoders here are the trainer's live modules; when they are
+            # being trained, downcasting would silently shear the fp32 master
+            # weights out from under the optimizer.
+            and not getattr(self.args, "train_text_encoder", False)
+        ):
+            for text_encoder in (
+                self.text_encoder_1,
+                self.text_encoder_2,
+                self.text_encoder_3,
+            ):
+                if text_encoder is not None:
+                    text_encoder.to(dtype=torch.bfloat16)
+        self._cast_negative_embeds()
+
+    def _cast_negative_embeds(self):
+        """
+        The negative prompt is fixed for the whole run, so its embeds are
+        moved to the inference device and dtype once here instead of on
+        every validation prompt.
+        """
+        casted = True
+        for attr in (
+            "validation_negative_prompt_embeds",
+            "validation_negative_pooled_embeds",
+        ):
+            embed = getattr(self, attr)
+            if embed is None:
+                continue
+            if not isinstance(embed, torch.Tensor):
+                # anything non-tensor falls back to the per-prompt cast.
+                casted = False
+                continue
+            if embed.device.type == "cpu" and torch.cuda.is_available():
+                embed = embed.pin_memory()
+            setattr(
+                self,
+                attr,
+                embed.to(
+                    device=self.inference_device,
+                    dtype=self.weight_dtype,
+                    non_blocking=True,
+                ).contiguous(),
+            )
+        self._neg_embeds_on_device = casted
+
+    @contextmanager
+    def _validation_context(self):
+        """
+        Run validation work under torch.inference_mode with training-side
+        memory released up front. Re-entrant, so nested helpers can use it
+        without repeating the gc/cache-clear work.
+        """
+        if self._in_validation_context:
+            yield
+            return
+        self._in_validation_context = True
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+            logger.debug(
+                f"Entering validation context with {torch.cuda.memory_allocated() / 1024**3:.2f} GiB allocated"
+            )
+        was_training = []
+        for model in (self.unet, self.transformer, self.controlnet):
+            if model is None or not hasattr(model, "eval"):
+                continue
+            # release optimiser-retained grad buffers and switch to eval,
+            # restoring the training flag on exit
+            model.zero_grad(set_to_none=True)
+            was_training.append((model, model.training))
+            model.eval()
+        try:
+            with torch.inference_mode():
+                yield
+        finally:
+            for model, training in was_training:
+                if training:
+                    model.train()
+            self._in_validation_context = False
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+    def _inference_autocast(self):
+        """bf16 autocast for the denoising loop, opt-in via
+        --validation_autocast_bf16; a no-op context otherwise."""
+        return torch.autocast(
+            device_type=torch.device(self.inference_device).type,
+            dtype=torch.bfloat16,
+            enabled=getattr(self.args, "validation_autocast_bf16", False),
+        )
 
     def _validation_seed_source(self):
         if self.args.validation_seed_source == "gpu":
@@ -487,11 +755,14 @@ class Validation:
             raise Exception("Unknown validation seed source. Options: cpu, gpu")
 
     def _get_generator(self):
-        _validation_seed_source = self._validation_seed_source()
-        _generator = torch.Generator(device=_validation_seed_source).manual_seed(
-            self.args.validation_seed or self.args.seed or 0
-        )
-        return _generator
+        # one generator per process, allocated lazily; constructing a CUDA
+        # generator per pipeline call would sync RNG state every time.
+        if self._generator is None:
+            self._generator = torch.Generator(device=self._validation_seed_source())
+            self._val_seed = self.args.validation_seed or self.args.seed or 0
+        # reseed the cached generator so each prompt stays reproducible
+        # without allocating fresh RNG state per call.
+        return self._generator.manual_seed(self._val_seed)
 
     def clear_text_encoders(self):
         """
@@ -503,6 +774,52 @@ class Validation:
         self.text_encoder_1 = None
         self.text_encoder_2 = None
         self.text_encoder_3 = None
+        self._prompt_embed_cache.clear()
+
+    def _auxiliary_modules(self):
+        # the VAE is deliberately absent: every pipeline call ends in a
+        # latent decode, so it cannot leave the device mid-validation. Its
+        # offload happens in finalize_validation, gated on keep_vae_loaded.
+        return [
+            module
+            for module in (
+                self.text_encoder_1,
+                self.text_encoder_2,
+                self.text_encoder_3,
+            )
+            if module is not None
+        ]
+
+    def _cpu_offload_auxiliaries(self):
+        """
+        Move the text encoders to CPU so their memory is free during the
+        denoising loop; the embeds are gathered up front, so nothing encodes
+        until _restore_auxiliaries brings them back. Skipped when the
+        encoders are live training modules (their optimizer state stays on
+        the accelerator) and under --warm_validation, whose whole point is
+        avoiding these PCIe round-trips.
+        """
+        if (
+            self._auxiliaries_offloaded
+            or getattr(self.args, "train_text_encoder", False)
+            or getattr(self.args, "warm_validation", False)
+        ):
+            return
+        modules = self._auxiliary_modules()
+        if not modules:
+            return
+        for module in modules:
+            module.to("cpu", non_blocking=True)
+        self._auxiliaries_offloaded = True
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _restore_auxiliaries(self):
+        if not self._auxiliaries_offloaded:
+            return
+        for module in self._auxiliary_modules():
+            module.to(self.inference_device, non_blocking=True)
+        self._auxiliaries_offloaded = False
 
     def init_vae(self):
 
@@ -530,7 +847,8 @@ class Validation:
                 ),
                 revision=args.revision,
                 force_upcast=False,
-            ).to(self.inference_device)
+                torch_dtype=self.weight_dtype,
+            ).to(self.inference_device, non_blocking=True)
         StateTracker.set_vae(self.vae)
 
         return self.vae
@@ -556,199 +874,141 @@ class Validation:
             )
 
     def _pipeline_cls(self):
-        model_type = StateTracker.get_model_family()
-        if model_type == "sdxl":
-            if self.args.controlnet:
-                from diffusers.pipelines import StableDiffusionXLControlNetPipeline
-
-                return StableDiffusionXLControlNetPipeline
-            if self.args.validation_using_datasets:
-                return StableDiffusionXLImg2ImgPipeline
-            return StableDiffusionXLPipeline
-        elif model_type == "flux":
-            from helpers.models.flux import FluxPipeline
-
-            if self.args.controlnet:
-                raise NotImplementedError("Flux ControlNet is not yet supported.")
-            if self.args.validation_using_datasets:
-                raise NotImplementedError(
-                    "Flux inference validation using img2img is not yet supported. Please remove --validation_using_datasets."
-                )
-            return FluxPipeline
-        elif model_type == "kolors":
-            if self.args.controlnet:
-                raise NotImplementedError("Kolors ControlNet is not yet supported.")
-            if self.args.validation_using_datasets:
-                try:
-                    from helpers.kolors.pipeline import KolorsImg2ImgPipeline
-                except:
-                    logger.error(
-                        "Kolors pipeline requires the latest version of Diffusers."
-                    )
-                return KolorsImg2ImgPipeline
-            try:
-                from helpers.kolors.pipeline import KolorsPipeline
-            except Exception:
-                logger.error(
-                    "Kolors pipeline requires the latest version of Diffusers."
-                )
-            return KolorsPipeline
-        elif model_type == "legacy":
-            if self.deepfloyd_stage2:
-                from diffusers.pipelines import IFSuperResolutionPipeline
-
-                return IFSuperResolutionPipeline
-            return StableDiffusionPipeline
-        elif model_type == "sd3":
-            if self.args.controlnet:
-                raise Exception("SD3 ControlNet is not yet supported.")
-            if self.args.validation_using_datasets:
-                return StableDiffusion3Img2ImgPipeline
-            return StableDiffusion3Pipeline
-        elif model_type == "pixart_sigma":
-            if self.args.controlnet:
-                raise Exception(
-                    "PixArt Sigma ControlNet inference validation is not yet supported."
-                )
-            if self.args.validation_using_datasets:
-                raise Exception(
-                    "PixArt Sigma inference validation using img2img is not yet supported. Please remove --validation_using_datasets."
-                )
-            from helpers.models.pixart.pipeline import PixArtSigmaPipeline
-
-            return PixArtSigmaPipeline
-        elif model_type == "smoldit":
-            from helpers.models.smoldit import SmolDiTPipeline
-
-            return SmolDiTPipeline
-        elif model_type == "sana":
-            from diffusers import SanaPipeline
+        model_type = self.model_family
+        if model_type == "legacy" and self.deepfloyd_stage2:
+            from diffusers.pipelines import IFSuperResolutionPipeline
+
+            return IFSuperResolutionPipeline
+        return _resolve_pipeline_cls(
+            model_type,
+            bool(self.args.controlnet),
+            bool(self.args.validation_using_datasets),
+        )
 
-            return SanaPipeline
-        else:
-            raise NotImplementedError(
-                f"Model type {model_type} not implemented for validation."
+    def _prompt_embed_cache_path(self, validation_prompt: str):
+        digest = hashlib.sha256(
+            f"{validation_prompt}:{self.model_family}:{self.args.revision}".encode(
+                "utf-8"
             )
+        ).hexdigest()
+        cache_dir = os.path.join(self.args.output_dir, "validation_cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        return os.path.join(cache_dir, f"{digest}.pt")
 
     def _gather_prompt_embeds(self, validation_prompt: str):
-        prompt_embeds = {}
-        current_validation_prompt_mask = None
-        if (
-            StateTracker.get_model_family() == "sdxl"
-            or StateTracker.get_model_family() == "sd3"
-            or StateTracker.get_model_family() == "kolors"
-            or StateTracker.get_model_family() == "flux"
-        ):
-            _embed = self.embed_cache.compute_embeddings_for_prompts(
-                [validation_prompt]
-            )
-            current_validation_time_ids = None
-            if len(_embed) == 2:
-                (
-                    current_validation_prompt_embeds,
-                    current_validation_pooled_embeds,
-                ) = _embed
-            elif len(_embed) == 3:
-                (
-                    current_validation_prompt_embeds,
-                    current_validation_pooled_embeds,
-                    current_validation_time_ids,
-                ) = _embed
-            elif len(_embed) == 4:
-                (
-                    current_validation_prompt_embeds,
-                    current_validation_pooled_embeds,
-                    current_validation_time_ids,
-                    current_validation_prompt_mask,
-                ) = _embed
-            else:
-                raise ValueError(
-                    f"Unexpected number of embeddings returned from cache: {_embed}"
+        # the validation prompt set is fixed, so embeds computed on an earlier
+        # validation run can be reused as-is. clear_text_encoders drops the
+        # in-process cache, since new encoders would produce different embeds.
+        cached = self._prompt_embed_cache.get(validation_prompt)
+        if cached is not None:
+            return dict(cached)
+        # the disk layer survives restarts; it is skipped entirely when the
+        # text encoders are being trained, since their output changes.
+        use_disk_cache = not getattr(self.args, "train_text_encoder", False)
+        if use_disk_cache:
+            cache_path = self._prompt_embed_cache_path(validation_prompt)
+            if os.path.exists(cache_path):
+                prompt_embeds = torch.load(
+                    cache_path, map_location=self.inference_device
                 )
-            current_validation_pooled_embeds = current_validation_pooled_embeds.to(
-                device=self.inference_device, dtype=self.weight_dtype
+                self._prompt_embed_cache[validation_prompt] = prompt_embeds
+                return dict(prompt_embeds)
+        # a cache miss means the encoders have to run; bring them back from
+        # CPU if a previous validation pass offloaded them.
+        self._restore_auxiliaries()
+        with self._validation_context():
+            prompt_embeds = self._gather_prompt_embeds_inner(validation_prompt)
+        if use_disk_cache:
+            torch.save(prompt_embeds, cache_path)
+        if len(self._prompt_embed_cache) >= 256:
+            self._prompt_embed_cache.clear()
+        self._prompt_embed_cache[validation_prompt] = prompt_embeds
+        return dict(prompt_embeds)
+
+    @contextmanager
+    def _transfer_context(self):
+        """
+        Issue the embed host-to-device copies on a dedicated stream so the
+        independent transfers can overlap on the copy engines; joins back
+        with the default stream on exit so downstream kernels see the data.
+        """
+        if self._transfer_stream is None:
+            yield
+            return
+        self._transfer_stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(self._transfer_stream):
+            yield
+        torch.cuda.current_stream().wait_stream(self._transfer_stream)
+
+    def _gather_prompt_embeds_inner(self, validation_prompt: str):
+        prompt_embeds = {}
+        family = self.model_family
+        unpacker = _EMBED_UNPACKERS.get(family)
+        if unpacker is None:
+            raise NotImplementedError(
+                f"Model type {family} not implemented for validation."
             )
-            if current_validation_time_ids is not None:
-                current_validation_time_ids = current_validation_time_ids.to(
-                    device=self.inference_device, dtype=self.weight_dtype
-                )
-            self.validation_negative_pooled_embeds = (
-                self.validation_negative_pooled_embeds.to(
-                    device=self.inference_device, dtype=self.weight_dtype
+        (
+            current_validation_prompt_embeds,
+            current_validation_pooled_embeds,
+            current_validation_time_ids,
+            current_validation_prompt_mask,
+        ) = unpacker(
+            self.embed_cache.compute_embeddings_for_prompts([validation_prompt])
+        )
+        with self._transfer_context():
+            if family in _POOLED_EMBED_FAMILIES:
+                current_validation_pooled_embeds = current_validation_pooled_embeds.to(
+                    device=self.inference_device,
+                    dtype=self.weight_dtype,
+                    non_blocking=True,
                 )
-            )
-            prompt_embeds["pooled_prompt_embeds"] = current_validation_pooled_embeds.to(
-                device=self.inference_device, dtype=self.weight_dtype
-            )
-            prompt_embeds["negative_pooled_prompt_embeds"] = (
-                self.validation_negative_pooled_embeds
-            )
-            # if current_validation_time_ids is not None:
-            #     prompt_embeds["time_ids"] = current_validation_time_ids
-        elif (
-            StateTracker.get_model_family() == "legacy"
-            or StateTracker.get_model_family() == "pixart_sigma"
-            or StateTracker.get_model_family() == "smoldit"
-            or StateTracker.get_model_family() == "sana"
-        ):
-            self.validation_negative_pooled_embeds = None
-            current_validation_pooled_embeds = None
-            current_validation_prompt_embeds = (
-                self.embed_cache.compute_embeddings_for_prompts([validation_prompt])
-            )
-            if StateTracker.get_model_family() in ["pixart_sigma", "smoldit", "sana"]:
-                current_validation_prompt_embeds, current_validation_prompt_mask = (
-                    current_validation_prompt_embeds
+                if current_validation_time_ids is not None:
+                    current_validation_time_ids = current_validation_time_ids.to(
+                        device=self.inference_device,
+                        dtype=self.weight_dtype,
+                        non_blocking=True,
+                    )
+                if not self._neg_embeds_on_device:
+                    self.validation_negative_pooled_embeds = (
+                        self.validation_negative_pooled_embeds.to(
+                            device=self.inference_device,
+                            dtype=self.weight_dtype,
+                            non_blocking=True,
+                        )
+                    )
+                prompt_embeds["pooled_prompt_embeds"] = current_validation_pooled_embeds
+                prompt_embeds["negative_pooled_prompt_embeds"] = (
+                    self.validation_negative_pooled_embeds
                 )
-                current_validation_prompt_embeds = current_validation_prompt_embeds[
-                    0
-                ].to(device=self.inference_device, dtype=self.weight_dtype)
-                if (
-                    type(self.validation_negative_prompt_embeds) is tuple
-                    or type(self.validation_negative_prompt_embeds) is list
-                ):
-                    (
-                        self.validation_negative_prompt_embeds,
-                        self.validation_negative_prompt_mask,
-                    ) = self.validation_negative_prompt_embeds[0]
+                # if current_validation_time_ids is not None:
+                #     prompt_embeds["time_ids"] = current_validation_time_ids
             else:
-                current_validation_prompt_embeds = current_validation_prompt_embeds[
-                    0
-                ].to(device=self.inference_device, dtype=self.weight_dtype)
-            # logger.debug(
-            #     f"Validations received the prompt embed: ({type(current_validation_prompt_embeds)}) positive={current_validation_prompt_embeds.shape if type(current_validation_prompt_embeds) is not list else current_validation_prompt_embeds[0].shape},"
-            #     f" ({type(self.validation_negative_prompt_embeds)}) negative={self.validation_negative_prompt_embeds.shape if type(self.validation_negative_prompt_embeds) is not list else self.validation_negative_prompt_embeds[0].shape}"
-            # )
-            # logger.debug(
-            #     f"Dtypes: {current_validation_prompt_embeds.dtype}, {self.validation_negative_prompt_embeds.dtype}"
-            # )
-        else:
-            raise NotImplementedError(
-                f"Model type {StateTracker.get_model_family()} not implemented for validation."
-            )
-
-        current_validation_prompt_embeds = current_validation_prompt_embeds.to(
-            device=self.inference_device, dtype=self.weight_dtype
-        )
-        self.validation_negative_prompt_embeds = (
-            self.validation_negative_prompt_embeds.to(
-                device=self.inference_device, dtype=self.weight_dtype
-            )
-        )
+                self.validation_negative_pooled_embeds = None
+
+            # contiguous layout keeps the pipeline-internal CFG concat a
+            # single coalesced copy per call rather than a strided gather.
+            current_validation_prompt_embeds = current_validation_prompt_embeds.to(
+                device=self.inference_device, dtype=self.weight_dtype, non_blocking=True
+            ).contiguous()
+            if not self._neg_embeds_on_device:
+                self.validation_negative_prompt_embeds = (
+                    self.validation_negative_prompt_embeds.to(
+                        device=self.inference_device,
+                        dtype=self.weight_dtype,
+                        non_blocking=True,
+                    )
+                )
+                self._neg_embeds_on_device = True
         # when sampling unconditional guidance, you should only zero one or the other prompt, and not both.
         # we'll assume that the user has a negative prompt, so that the unconditional sampling works.
         # the positive prompt embed is zeroed out for SDXL at the time of it being placed into the cache.
         # the embeds are not zeroed out for any other model, including Stable Diffusion 3.
         prompt_embeds["prompt_embeds"] = current_validation_prompt_embeds
         prompt_embeds["negative_prompt_embeds"] = self.validation_negative_prompt_embeds
-        if (
-            StateTracker.get_model_family() == "pixart_sigma"
-            or StateTracker.get_model_family() == "smoldit"
-            or StateTracker.get_model_family() == "sana"
-            or (
-                StateTracker.get_model_family() == "flux"
-                and StateTracker.get_args().flux_attention_masked_training
-            )
+        if family in _MASKED_EMBED_FAMILIES or (
+            family == "flux"
+            and self._st_args.flux_attention_masked_training
         ):
             logger.debug(
                 f"mask: {current_validation_prompt_mask.shape if type(current_validation_prompt_mask) is torch.Tensor else None}"
@@ -760,10 +1020,11 @@ class Validation:
         return prompt_embeds
 
     def _benchmark_path(self, benchmark: str = "base_model"):
-        # does the benchmark directory exist?
-        if not os.path.exists(os.path.join(self.args.output_dir, "benchmarks")):
-            os.makedirs(os.path.join(self.args.output_dir, "benchmarks"), exist_ok=True)
-        return os.path.join(self.args.output_dir, "benchmarks", benchmark)
+        parent = os.path.join(self.args.output_dir, "benchmarks")
+        if parent not in self._ensured_dirs:
+            os.makedirs(parent, exist_ok=True)
+            self._ensured_dirs.add(parent)
+        return os.path.join(parent, benchmark)
 
     def stitch_benchmark_image(
         self,
@@ -797,10 +1058,7 @@ class Validation:
         draw = ImageDraw.Draw(new_image)
 
         # Use a default font
-        try:
-            font = ImageFont.truetype("arial.ttf", 36)
-        except IOError:
-            font = ImageFont.load_default()
+        font = _stitch_font()
 
         # Add text to the left image
         if labels[0] is not None:
@@ -824,85 +1082,165 @@ class Validation:
                 stroke_fill=(0, 0, 0),
             )
 
-        # Draw a vertical line as a separator
+        # Draw a vertical separator strip in one call
         line_color = (200, 200, 200)  # Light gray
-        for i in range(separator_width):
-            x = validation_image_result.size[0] + i
-            draw.line([(x, 0), (x, new_height)], fill=line_color)
+        draw.rectangle(
+            [
+                (validation_image_result.size[0], 0),
+                (validation_image_result.size[0] + separator_width - 1, new_height),
+            ],
+            fill=line_color,
+        )
 
         return new_image
 
+    def _stitch_benchmark_images_batch(
+        self,
+        validation_image_results,
+        benchmark_image,
+        separator_width=5,
+        labels=["base model", "checkpoint"],
+    ):
+        """
+        Stitch every validation result against the same benchmark image. The
+        benchmark is converted to numpy once and each composite is assembled
+        with slice writes into a preallocated buffer; only the text labels
+        still go through PIL's renderer.
+        """
+        bench_np = np.asarray(benchmark_image.convert("RGB"))
+        bench_width = bench_np.shape[1]
+        font = _stitch_font()
+        stitched = []
+        for validation_image_result in validation_image_results:
+            result_np = np.asarray(validation_image_result.convert("RGB"))
+            if result_np.shape[0] != bench_np.shape[0]:
+                # height mismatch; the canvas-and-paste path handles cropping.
+                stitched.append(
+                    self.stitch_benchmark_image(
+                        validation_image_result=validation_image_result,
+                        benchmark_image=benchmark_image,
+                        separator_width=separator_width,
+                        labels=labels,
+                    )
+                )
+                continue
+            out = np.empty(
+                (
+                    bench_np.shape[0],
+                    bench_width + separator_width + result_np.shape[1],
+                    3,
+                ),
+                dtype=np.uint8,
+            )
+            out[:, :bench_width] = bench_np
+            out[:, bench_width : bench_width + separator_width] = (200, 200, 200)
+            out[:, bench_width + separator_width :] = result_np
+            new_image = Image.fromarray(out)
+            draw = ImageDraw.Draw(new_image)
+            if labels[0] is not None:
+                draw.text(
+                    (10, 10),
+                    labels[0],
+                    fill=(255, 255, 255),
+                    font=font,
+                    stroke_width=2,
+                    stroke_fill=(0, 0, 0),
+                )
+            if labels[1] is not None:
+                draw.text(
+                    (bench_width + separator_width + 10, 10),
+                    labels[1],
+                    fill=(255, 255, 255),
+                    font=font,
+                    stroke_width=2,
+                    stroke_fill=(0, 0, 0),
+                )
+            stitched.append(new_image)
+        return stitched
+
     def _benchmark_image(self, shortname, resolution):
         """
         We will retrieve the benchmark image for the shortname.
         """
         if not self.benchmark_exists():
             return None
-        base_model_benchmark = self._benchmark_path("base_model")
-        benchmark_image = None
-        _test_filename = f"{shortname}_{resolution[0]}x{resolution[1]}.png"
-        for _benchmark_image in os.listdir(base_model_benchmark):
-            _basename = os.path.basename(_benchmark_image)
-            if _basename == _test_filename:
-                benchmark_image = Image.open(
-                    os.path.join(base_model_benchmark, _benchmark_image)
-                )
-                break
-
-        return benchmark_image
+        # benchmark filenames are fully determined by shortname and
+        # resolution, so construct the path and let the filesystem answer
+        # instead of scanning the directory.
+        benchmark_path = os.path.join(
+            self._benchmark_path("base_model"),
+            f"{shortname}_{resolution[0]}x{resolution[1]}.png",
+        )
+        try:
+            return Image.open(benchmark_path)
+        except FileNotFoundError:
+            return None
 
     def _benchmark_images(self):
         """
-        We will retrieve the benchmark images so they can be stitched to the validation outputs.
+        Yield (shortname, description, path) tuples for the benchmark images
+        so they can be stitched to the validation outputs. Paths are returned
+        instead of decoded images; callers should open them on demand so only
+        one decoded image is resident at a time.
         """
         if not self.benchmark_exists():
-            return None
-        benchmark_images = []
+            return
         base_model_benchmark = self._benchmark_path("base_model")
         for _benchmark_image in os.listdir(base_model_benchmark):
             if _benchmark_image.endswith(".png"):
-                benchmark_images.append(
-                    (
-                        _benchmark_image.replace(".png", ""),
-                        f"Base model benchmark image {_benchmark_image}",
-                        Image.open(
-                            os.path.join(base_model_benchmark, _benchmark_image)
-                        ),
-                    )
+                yield (
+                    _benchmark_image.replace(".png", ""),
+                    f"Base model benchmark image {_benchmark_image}",
+                    os.path.join(base_model_benchmark, _benchmark_image),
                 )
 
-        return benchmark_images
-
     def benchmark_exists(self, benchmark: str = "base_model"):
         """
         Determines whether the base model benchmark outputs already exist.
         """
-        base_model_benchmark = self._benchmark_path()
+        if self._benchmark_dir_exists is None:
+            self._benchmark_dir_exists = os.path.exists(self._benchmark_path())
 
-        return os.path.exists(base_model_benchmark)
+        return self._benchmark_dir_exists
 
     def save_benchmark(self, benchmark: str = "base_model"):
         """
         Saves the benchmark outputs for the base model.
         """
         base_model_benchmark = self._benchmark_path(benchmark=benchmark)
-        if not os.path.exists(base_model_benchmark):
+        if base_model_benchmark not in self._ensured_dirs:
             os.makedirs(base_model_benchmark, exist_ok=True)
+            self._ensured_dirs.add(base_model_benchmark)
+        # new outputs invalidate the cached directory state.
+        self._benchmark_dir_exists = None
         if self.validation_images is None:
             return
         for shortname, image_list in self.validation_images.items():
             for idx, image in enumerate(image_list):
                 width, height = image.size
-                image.save(
-                    os.path.join(
-                        base_model_benchmark, f"{shortname}_{width}x{height}.png"
+                self._save_futures.append(
+                    self._save_pool.submit(
+                        image.save,
+                        os.path.join(
+                            base_model_benchmark, f"{shortname}_{width}x{height}.png"
+                        ),
+                        optimize=False,
+                        compress_level=1,
                     )
                 )
 
+    def _drain_save_pool(self):
+        """Block until all queued benchmark writes have hit disk."""
+        for future in self._save_futures:
+            future.result()
+        self._save_futures.clear()
+
     def _update_state(self):
         """Updates internal state with the latest from StateTracker."""
         self.global_step = StateTracker.get_global_step()
         self.global_resume_step = StateTracker.get_global_resume_step() or 1
+        self.model_family = StateTracker.get_model_family()
+        self._st_args = StateTracker.get_args()
 
     def would_validate(
         self,
@@ -911,6 +1249,10 @@ class Validation:
         force_evaluation: bool = False,
     ):
         # a wrapper for should_perform_validation that can run in the training loop
+        if validation_type == "intermediary" and step % self._grad_accum != 0:
+            # cheapest predicate first; skips the StateTracker round-trip on
+            # the vast majority of steps.
+            return False
         self._update_state()
         return self.should_perform_validation(
             step, self.validation_prompts, validation_type
@@ -924,6 +1266,15 @@ class Validation:
         skip_execution: bool = False,
     ):
         self._update_state()
+        if (
+            not self.validation_prompts
+            and not self.validation_image_inputs
+            and validation_type != "final"
+            and not force_evaluation
+        ):
+            # nothing to render — skip the pipeline build and scheduler
+            # setup entirely rather than iterating over an empty prompt list.
+            return self
         should_validate = self.should_perform_validation(
             step, self.validation_prompts, validation_type
         ) or (step == 0 and validation_type == "base_model")
@@ -945,29 +1296,44 @@ class Validation:
         if self.accelerator.is_main_process or self.deepspeed:
             logger.debug("Starting validation process...")
             diffusers.utils.logging._tqdm_active = False
-            self.setup_pipeline(validation_type)
-            if self.pipeline is None:
-                logger.error(
-                    "Not able to run validations, we did not obtain a valid pipeline."
-                )
-                self.validation_images = None
-                return self
-            self.setup_scheduler()
-            self.process_prompts()
-            self.finalize_validation(validation_type)
+            if validation_type == "final" and self.pipeline is not None:
+                # final validations rebuild the pipeline so the trained text
+                # encoders are attached; intermediary runs reuse it.
+                self.clean_pipeline()
+            # autotune convolution kernels per shape for the duration of the
+            # run; the validation resolutions form a small static set, so the
+            # benchmark cost is paid once per shape. The flag is process
+            # global and aspect-bucketed training cycles shapes, so restore
+            # the training-side value afterwards.
+            cudnn_benchmark_prior = torch.backends.cudnn.benchmark
+            if torch.cuda.is_available():
+                torch.backends.cudnn.benchmark = True
+            try:
+                self.setup_pipeline(validation_type)
+                if self.pipeline is None:
+                    logger.error(
+                        "Not able to run validations, we did not obtain a valid pipeline."
+                    )
+                    self.validation_images = None
+                    return self
+                self.setup_scheduler()
+                self.process_prompts()
+                self.finalize_validation(validation_type)
+            finally:
+                torch.backends.cudnn.benchmark = cudnn_benchmark_prior
             if self.evaluation_result is not None:
                 logger.info(f"Evaluation result: {self.evaluation_result}")
             logger.debug("Validation process completed.")
-            self.clean_pipeline()
+            self.clean_pipeline(keep_resident=validation_type != "final")
 
         return self
 
     def should_perform_validation(self, step, validation_prompts, validation_type):
         should_do_intermediary_validation = (
-            validation_prompts
-            and self.global_step % self.args.validation_steps == 0
-            and step % self.args.gradient_accumulation_steps == 0
+            step % self._grad_accum == 0
+            and self.global_step % self._val_steps == 0
             and self.global_step > self.global_resume_step
+            and validation_prompts
         )
         is_final_validation = validation_type == "final"
         return (is_final_validation or should_do_intermediary_validation) and (
@@ -998,9 +1364,9 @@ class Validation:
             scheduler_args["variance_type"] = variance_type
         if self.deepfloyd:
             self.args.validation_noise_scheduler = "ddpm"
-        scheduler = SCHEDULER_NAME_MAP[
+        scheduler = _get_scheduler_cls(
             self.args.validation_noise_scheduler
-        ].from_pretrained(
+        ).from_pretrained(
             self.args.pretrained_model_name_or_path,
             subfolder="scheduler",
             revision=self.args.revision,
@@ -1032,7 +1398,10 @@ class Validation:
                 extra_pipeline_kwargs["text_encoder_2"] = None
             if self.args.model_family in ["sd3"]:
                 extra_pipeline_kwargs["text_encoder_3"] = None
-            if type(pipeline_cls) is StableDiffusionXLPipeline:
+            if (
+                self.args.model_family == "sdxl"
+                and type(pipeline_cls).__name__ == "StableDiffusionXLPipeline"
+            ):
                 del extra_pipeline_kwargs["text_encoder"]
                 del extra_pipeline_kwargs["tokenizer"]
                 if validation_type == "final":
@@ -1146,37 +1515,133 @@ class Validation:
                         "LyCORIS does not support torch compile for validation due to graph compile breaks. Disabling. Set --validation_torch_compile=False to suppress this warning."
                     )
                 else:
+                    # compile once per process and reuse the wrapper across
+                    # pipeline rebuilds so later validations replay the cached
+                    # graphs instead of recompiling.
+                    compile_kwargs = {
+                        "mode": self.args.validation_torch_compile_mode,
+                        "fullgraph": False,
+                        # validation resolutions are a small, static bucket set
+                        # (already rounded to multiples of 64), so specialising
+                        # per shape caps recompiles at one per unique bucket
+                        # for the whole run instead of emitting dynamic guards.
+                        "dynamic": False,
+                    }
                     if self.unet is not None and not is_compiled_module(self.unet):
-                        logger.warning(
-                            f"Compiling the UNet for validation ({self.args.validation_torch_compile})"
-                        )
-                        self.pipeline.unet = torch.compile(
-                            self.pipeline.unet,
-                            mode=self.args.validation_torch_compile_mode,
-                            fullgraph=False,
-                        )
+                        if (
+                            self._compiled_unet is None
+                            or getattr(self._compiled_unet, "_orig_mod", None)
+                            is not self.pipeline.unet
+                        ):
+                            logger.warning(
+                                f"Compiling the UNet for validation ({self.args.validation_torch_compile})"
+                            )
+                            self._compiled_unet = torch.compile(
+                                self.pipeline.unet, **compile_kwargs
+                            )
+                        self.pipeline.unet = self._compiled_unet
                     if self.transformer is not None and not is_compiled_module(
                         self.transformer
                     ):
-                        logger.warning(
-                            f"Compiling the transformer for validation ({self.args.validation_torch_compile})"
-                        )
-                        self.pipeline.transformer = torch.compile(
-                            self.pipeline.transformer,
-                            mode=self.args.validation_torch_compile_mode,
-                            fullgraph=False,
-                        )
-
-        self.pipeline = self.pipeline.to(self.inference_device)
+                        if (
+                            self._compiled_transformer is None
+                            or getattr(self._compiled_transformer, "_orig_mod", None)
+                            is not self.pipeline.transformer
+                        ):
+                            logger.warning(
+                                f"Compiling the transformer for validation ({self.args.validation_torch_compile})"
+                            )
+                            self._compiled_transformer = torch.compile(
+                                self.pipeline.transformer, **compile_kwargs
+                            )
+                        self.pipeline.transformer = self._compiled_transformer
+                    if (
+                        self.args.controlnet
+                        and getattr(self.pipeline, "controlnet", None) is not None
+                        and not is_compiled_module(self.pipeline.controlnet)
+                    ):
+                        if (
+                            self._compiled_controlnet is None
+                            or getattr(self._compiled_controlnet, "_orig_mod", None)
+                            is not self.pipeline.controlnet
+                        ):
+                            logger.warning(
+                                f"Compiling the ControlNet for validation ({self.args.validation_torch_compile})"
+                            )
+                            self._compiled_controlnet = torch.compile(
+                                self.pipeline.controlnet, **compile_kwargs
+                            )
+                        self.pipeline.controlnet = self._compiled_controlnet
+
+        if not self._pipeline_on_device:
+            # traversing every parameter with .to() is wasted work when the
+            # resident pipeline's components never left the device. A freshly
+            # built pipeline can also already sit on-device (its components
+            # are the live training modules), so probe before the full walk.
+            if not self._pipeline_components_on_device():
+                self.pipeline = self.pipeline.to(self.inference_device)
+            self._pipeline_on_device = True
+            if (
+                (
+                    getattr(self.args, "validation_autocast_bf16", False)
+                    or self.args.validation_torch_compile
+                )
+                and not self._channels_last_applied
+                and getattr(self.pipeline, "unet", None) is not None
+                and any(
+                    isinstance(module, torch.nn.Conv2d)
+                    for module in self.pipeline.unet.modules()
+                )
+            ):
+                # NHWC lines the conv-heavy UNet up with cuDNN's fastest
+                # kernels; transformer denoisers carry no convolutions and
+                # are skipped by the Conv2d probe. Layout conversion is a
+                # one-time cost, so remember that it happened.
+                self.pipeline.unet.to(memory_format=torch.channels_last)
+                self._channels_last_applied = True
         self.pipeline.set_progress_bar_config(disable=True)
 
-    def clean_pipeline(self):
-        """Remove the pipeline."""
+    def _pipeline_components_on_device(self):
+        """Whether every pipeline module already lives on the inference device.
+
+        Checks one parameter per component, so a positive answer saves the
+        O(#parameters) traversal that pipeline.to() performs regardless of
+        whether any tensor actually moves.
+        """
+        target = torch.device(self.inference_device)
+        found_any = False
+        for component in getattr(self.pipeline, "components", {}).values():
+            if not isinstance(component, torch.nn.Module):
+                continue
+            try:
+                current = next(component.parameters()).device
+            except StopIteration:
+                continue
+            found_any = True
+            if current.type != target.type:
+                return False
+            if target.index is not None and current.index != target.index:
+                return False
+        return found_any
+
+    def clean_pipeline(self, keep_resident: bool = False):
+        """Remove the pipeline, or retain it for the next validation."""
+        # later validations read the benchmark files back, so settle any
+        # in-flight writes before handing control back to the trainer.
+        self._drain_save_pool()
         if hasattr(self.accelerator, "_lycoris_wrapped_network"):
             self.accelerator._lycoris_wrapped_network.set_multiplier(1.0)
+        if keep_resident and self.pipeline is not None:
+            # keeping the wrapper avoids the from_pretrained rebuild on the
+            # next intermediary validation. It only holds references to
+            # components that stay resident anyway, so the memory cost is nil;
+            # the trainable modules are shared objects, so the next run sees
+            # the updated weights without rebinding.
+            return
         if self.pipeline is not None:
             del self.pipeline
             self.pipeline = None
+        self._pipeline_on_device = False
 
     def process_prompts(self):
         """Processes each validation prompt and logs the result."""
@@ -1194,6 +1659,56 @@ class Validation:
             # Override the pipeline inputs to be entirely based upon the validation image inputs.
             _content = self.validation_image_inputs
             total_samples = len(_content) if _content is not None else 0
+        family = self.model_family
+        can_batch = (
+            not self.validation_image_inputs
+            and not self.args.controlnet
+            and not self.args.validation_using_datasets
+            and not self.deepfloyd
+            and family not in _MASKED_EMBED_FAMILIES
+            and not (family == "flux" and self.args.flux_attention_masked_training)
+            and not (self.args.use_ema and self.args.ema_validation == "comparison")
+            and total_samples > 1
+        )
+        if can_batch:
+            # plain text-to-image runs share one pipeline call per resolution;
+            # anything needing per-prompt inputs (img2img, controlnet, masks,
+            # EMA comparisons) takes the per-prompt loop below.
+            prompt_batches = []
+            for shortname, prompt in _content:
+                self.validation_prompt_dict[shortname] = prompt
+                prompt_batches.append((shortname, prompt))
+            for prompt_batch in tqdm(
+                list(_chunks(prompt_batches, 4)),
+                desc="Processing validation prompt batches",
+                leave=False,
+                position=1,
+            ):
+                results = self.validate_prompt_batch(prompt_batch)
+                for shortname, prompt in prompt_batch:
+                    if results is not None:
+                        stitched, checkpoint, _ = results
+                        validation_images[shortname] = stitched.get(shortname, [])
+                        checkpoint_images = {
+                            shortname: checkpoint.get(shortname, [])
+                        }
+                    else:
+                        # the embeds could not share a batch; generate alone.
+                        stitched, checkpoint_images, _ = self.validate_prompt(
+                            prompt, shortname
+                        )
+                        validation_images.update(stitched)
+                    self._save_images(validation_images, shortname, prompt)
+                    self.validation_images = validation_images
+                    self.evaluation_result = self.evaluate_images(checkpoint_images)
+                    self._log_validations_to_webhook(
+                        validation_images, shortname, prompt
+                    )
+            try:
+                self._log_validations_to_trackers(validation_images)
+            except Exception as e:
+                logger.error(f"Error logging validation images: {e}")
+            return
         for content in tqdm(
             _content if _content else [],
             desc="Processing validation prompts",
@@ -1239,6 +1754,23 @@ class Validation:
         """
         For each image, make a new canvas and place it side by side with its equivalent from {self.validation_image_inputs}
         """
+        if not validation_image_results:
+            return []
+        results_np = np.stack(
+            [np.asarray(img.convert("RGB")) for img in validation_image_results]
+        )
+        cond_np = np.asarray(conditioning_image.convert("RGB"))
+        if cond_np.shape == results_np.shape[1:]:
+            # single contiguous concat; the conditioning image is broadcast
+            # across the batch instead of being pasted once per result.
+            out = np.concatenate(
+                [results_np, np.broadcast_to(cond_np[None], results_np.shape)],
+                axis=2,
+            )
+            return [Image.fromarray(out[idx]) for idx in range(out.shape[0])]
+
+        # mismatched sizes fall back to the canvas-and-paste path, which
+        # crops or letterboxes the conditioning image like PIL always has.
         stitched_validation_images = []
         for idx, image in enumerate(validation_image_results):
             new_width = image.size[0] * 2
@@ -1270,10 +1802,15 @@ class Validation:
         # Placeholder for actual image generation and logging
         logger.debug(f"Validating prompt: {prompt}")
         # benchmarked / stitched validation images
-        stitched_validation_images = {}
+        stitched_validation_images = {validation_shortname: []}
         # untouched / un-stitched validation images
-        checkpoint_validation_images = {}
-        ema_validation_images = {}
+        checkpoint_validation_images = {validation_shortname: []}
+        ema_validation_images = {validation_shortname: []}
+        # phase one: build the kwargs for every resolution up front, so the
+        # generation loop below can run the whole grid per validation type
+        # and comparison mode pays one EMA weight swap per prompt instead of
+        # one per resolution.
+        prepared = []
         for resolution in self.validation_resolutions:
             extra_validation_kwargs = {}
             if validation_input_image is not None:
@@ -1322,7 +1859,7 @@ class Validation:
                     self.args.validation_guidance_rescale
                 )
 
-            if StateTracker.get_args().validation_using_datasets:
+            if self._st_args.validation_using_datasets:
                 extra_validation_kwargs["strength"] = getattr(
                     self.args, "validation_strength", 0.2
                 )
@@ -1333,10 +1870,6 @@ class Validation:
             logger.debug(
                 f"Processing width/height: {validation_resolution_width}x{validation_resolution_height}"
             )
-            if validation_shortname not in stitched_validation_images:
-                stitched_validation_images[validation_shortname] = []
-                checkpoint_validation_images[validation_shortname] = []
-                ema_validation_images[validation_shortname] = []
             try:
                 extra_validation_kwargs.update(self._gather_prompt_embeds(prompt))
             except Exception as e:
@@ -1384,23 +1917,16 @@ class Validation:
                 for key, value in self.pipeline.components.items():
                     if hasattr(value, "device"):
                         logger.debug(f"Device for {key}: {value.device}")
-                if StateTracker.get_model_family() == "flux":
-                    if "negative_prompt" in pipeline_kwargs:
-                        del pipeline_kwargs["negative_prompt"]
+                if self.model_family == "flux":
+                    pipeline_kwargs.pop("negative_prompt", None)
                 if self.args.model_family == "sana":
                     pipeline_kwargs["complex_human_instruction"] = (
                         self.args.sana_complex_human_instruction
                     )
 
-                if (
-                    StateTracker.get_model_family() == "pixart_sigma"
-                    or StateTracker.get_model_family() == "smoldit"
-                    or StateTracker.get_model_family() == "sana"
-                ):
-                    if pipeline_kwargs.get("negative_prompt") is not None:
-                        del pipeline_kwargs["negative_prompt"]
-                    if pipeline_kwargs.get("prompt") is not None:
-                        del pipeline_kwargs["prompt"]
+                if self.model_family in _MASKED_EMBED_FAMILIES:
+                    pipeline_kwargs.pop("negative_prompt", None)
+                    pipeline_kwargs.pop("prompt", None)
                     pipeline_kwargs["prompt_attention_mask"] = pipeline_kwargs.pop(
                         "prompt_mask"
                     )[0].to(device=self.inference_device, dtype=self.weight_dtype)
@@ -1408,67 +1934,118 @@ class Validation:
                         pipeline_kwargs.pop("negative_mask")[0], dim=0
                     ).to(device=self.inference_device, dtype=self.weight_dtype)
 
-                validation_types = self._validation_types()
-                all_validation_type_results = {}
-                for current_validation_type in validation_types:
-                    if not self.args.validation_randomize:
-                        pipeline_kwargs["generator"] = self._get_generator()
-                        logger.debug(
-                            f"Using a generator? {pipeline_kwargs['generator']}"
-                        )
-                    if current_validation_type == "ema":
-                        self.enable_ema_for_inference()
-                    all_validation_type_results[current_validation_type] = (
-                        self.pipeline(**pipeline_kwargs).images
-                    )
-                    if current_validation_type == "ema":
-                        self.disable_ema_for_inference()
-
-                # retrieve the default image result for stitching to controlnet inputs.
-                ema_image_results = all_validation_type_results.get("ema")
-                validation_image_results = all_validation_type_results.get(
-                    "checkpoint", ema_image_results
-                )
-                original_validation_image_results = validation_image_results
-                benchmark_image = None
-                if self.args.controlnet:
-                    validation_image_results = self.stitch_conditioning_images(
-                        original_validation_image_results,
-                        extra_validation_kwargs["image"],
-                    )
-                elif not self.args.disable_benchmark and self.benchmark_exists(
-                    "base_model"
+                # note: reusing mid-loop latents across training steps (FORA/
+                # NIRVANA-style step skipping) is not possible here — none of
+                # the validation pipelines accept a resume step, and passing a
+                # half-denoised latent as `latents` would be treated as pure
+                # noise. Repeat-prompt savings come from the embed cache
+                # instead.
+                bench_future = None
+                if (
+                    not self.args.controlnet
+                    and not self.args.disable_benchmark
+                    and self.benchmark_exists("base_model")
                 ):
-                    benchmark_image = self._benchmark_image(
-                        validation_shortname, resolution
+                    # prefetch the benchmark decode so it overlaps the
+                    # denoising loop instead of following it.
+                    bench_future = self._save_pool.submit(
+                        self._benchmark_image, validation_shortname, resolution
                     )
-                    if benchmark_image is not None:
-                        for idx, validation_image in enumerate(
-                            validation_image_results
-                        ):
-                            validation_image_results[idx] = self.stitch_benchmark_image(
-                                validation_image_result=validation_image,
-                                benchmark_image=benchmark_image,
-                            )
-
-                checkpoint_validation_images[validation_shortname].extend(
-                    original_validation_image_results
+                prepared.append(
+                    {
+                        "pipeline_kwargs": pipeline_kwargs,
+                        "extra_validation_kwargs": extra_validation_kwargs,
+                        "bench_future": bench_future,
+                        "results": {},
+                        "failed": False,
+                    }
                 )
-                stitched_validation_images[validation_shortname].extend(
-                    validation_image_results
-                )
-                if self.args.use_ema:
-                    ema_validation_images[validation_shortname].extend(
-                        ema_image_results
-                    )
-
             except Exception as e:
                 import traceback
 
                 logger.error(
-                    f"Error generating validation image: {e}, {traceback.format_exc()}"
+                    f"Error preparing validation image: {e}, {traceback.format_exc()}"
                 )
                 continue
+
+        # every embed for this prompt is gathered now, so the text encoders
+        # can vacate the device for the denoising phase.
+        self._cpu_offload_auxiliaries()
+
+        # phase two: one pass over the prepared grid per validation type, so
+        # the EMA store/copy/restore sequence runs at most once per prompt.
+        for current_validation_type in self._validation_types():
+            if current_validation_type == "ema":
+                self.enable_ema_for_inference()
+            for entry in prepared:
+                pipeline_kwargs = entry["pipeline_kwargs"]
+                if not self.args.validation_randomize:
+                    pipeline_kwargs["generator"] = self._get_generator()
+                    logger.debug(f"Using a generator? {pipeline_kwargs['generator']}")
+                try:
+                    # inference_mode drops the autograd bookkeeping for the
+                    # whole denoising loop; the EMA weight swaps stay outside
+                    # it because they mutate parameters in place.
+                    with torch.inference_mode(), self._inference_autocast():
+                        entry["results"][current_validation_type] = self.pipeline(
+                            **pipeline_kwargs
+                        ).images
+                except Exception as e:
+                    import traceback
+
+                    logger.error(
+                        f"Error generating validation image: {e}, {traceback.format_exc()}"
+                    )
+                    entry["failed"] = True
+            if current_validation_type == "ema":
+                self.disable_ema_for_inference()
+
+        # phase three: stitching and bookkeeping on CPU-side data, after all
+        # weight swapping is done. Decoding straight to tensors and stitching
+        # on-GPU (output_type="pt") was considered and rejected: every
+        # downstream consumer (labels, disk saves, webhooks, trackers) wants
+        # PIL, and the numpy batch stitcher already composes into single
+        # preallocated buffers rather than extra canvases.
+        benchmark_image = None
+        for entry in prepared:
+            # the embed copies and conditioning references are dead weight
+            # once generation is done; drop them before the stitch work so
+            # they do not pin device memory across the loop.
+            pipeline_kwargs = entry.pop("pipeline_kwargs")
+            del pipeline_kwargs
+            if entry["failed"]:
+                continue
+            all_validation_type_results = entry["results"]
+            # retrieve the default image result for stitching to controlnet inputs.
+            ema_image_results = all_validation_type_results.get("ema")
+            validation_image_results = all_validation_type_results.get(
+                "checkpoint", ema_image_results
+            )
+            original_validation_image_results = validation_image_results
+            benchmark_image = None
+            if self.args.controlnet:
+                validation_image_results = self.stitch_conditioning_images(
+                    original_validation_image_results,
+                    entry["extra_validation_kwargs"]["image"],
+                )
+            elif entry["bench_future"] is not None:
+                benchmark_image = entry["bench_future"].result()
+                if benchmark_image is not None:
+                    # slice assignment keeps the list identity, matching
+                    # the previous in-place per-index stitching.
+                    validation_image_results[:] = self._stitch_benchmark_images_batch(
+                        validation_image_results, benchmark_image
+                    )
+
+            checkpoint_validation_images[validation_shortname].extend(
+                original_validation_image_results
+            )
+            stitched_validation_images[validation_shortname].extend(
+                validation_image_results
+            )
+            if self.args.use_ema:
+                ema_validation_images[validation_shortname].extend(ema_image_results)
+
         if (
             self.args.use_ema
             and self.args.ema_validation == "comparison"
@@ -1495,38 +2072,264 @@ class Validation:
             ema_validation_images,
         )
 
+    def _batched_prompt_embeds(self, prompts):
+        """
+        Concatenate per-prompt embeds into one batch, repeating the
+        run-constant negative embeds to match. Returns None when the embeds
+        cannot be concatenated, in which case the caller should fall back to
+        per-prompt generation.
+        """
+        gathered = [self._gather_prompt_embeds(prompt) for prompt in prompts]
+        batch = {}
+        for key in gathered[0]:
+            values = [g.get(key) for g in gathered]
+            if key.startswith("negative"):
+                value = values[0]
+                if not isinstance(value, torch.Tensor):
+                    return None
+                batch[key] = value.repeat(len(prompts), *([1] * (value.dim() - 1)))
+                continue
+            if not all(
+                isinstance(value, torch.Tensor) and value.shape == values[0].shape
+                for value in values
+            ):
+                return None
+            batch[key] = torch.cat(values, dim=0)
+        return batch
+
+    def validate_prompt_batch(self, prompt_batch):
+        """
+        Generate validation images for several prompts with one pipeline call
+        per resolution, amortising the per-call scheduler and launch overhead.
+        Only the plain text-to-image path is supported; returns None when the
+        prompt embeds cannot share a batch so the caller can fall back to
+        validate_prompt.
+        """
+        shortnames = [shortname for shortname, _ in prompt_batch]
+        prompts = [prompt for _, prompt in prompt_batch]
+        batched_embeds = self._batched_prompt_embeds(prompts)
+        if batched_embeds is None:
+            return None
+        # the whole batch's embeds are on device now; the text encoders sit
+        # idle through the denoising loop, so free their VRAM.
+        self._cpu_offload_auxiliaries()
+        logger.debug(f"Validating prompt batch: {shortnames}")
+        stitched_validation_images = {shortname: [] for shortname in shortnames}
+        checkpoint_validation_images = {shortname: [] for shortname in shortnames}
+        ema_validation_images = {shortname: [] for shortname in shortnames}
+        num_images = self.args.num_validation_images
+        for resolution in self.validation_resolutions:
+            validation_resolution_width, validation_resolution_height = resolution
+            pipeline_kwargs = {
+                "prompt": None,
+                "negative_prompt": None,
+                "num_images_per_prompt": num_images,
+                "num_inference_steps": self.args.validation_num_inference_steps,
+                "guidance_scale": self.args.validation_guidance,
+                "height": MultiaspectImage._round_to_nearest_multiple(
+                    int(validation_resolution_height)
+                ),
+                "width": MultiaspectImage._round_to_nearest_multiple(
+                    int(validation_resolution_width)
+                ),
+                **batched_embeds,
+            }
+            if (
+                self.args.model_family == "sd3"
+                and type(self.args.validation_guidance_skip_layers) is list
+            ):
+                pipeline_kwargs["skip_layer_guidance_start"] = float(
+                    self.args.validation_guidance_skip_layers_start
+                )
+                pipeline_kwargs["skip_layer_guidance_stop"] = float(
+                    self.args.validation_guidance_skip_layers_stop
+                )
+                pipeline_kwargs["skip_layer_guidance_scale"] = float(
+                    self.args.validation_guidance_skip_scale
+                )
+                pipeline_kwargs["skip_guidance_layers"] = list(
+                    self.args.validation_guidance_skip_layers
+                )
+            if not self.flow_matching and self.args.model_family not in [
+                "deepfloyd",
+                "pixart_sigma",
+                "kolors",
+                "flux",
+                "sd3",
+                "sana",
+            ]:
+                pipeline_kwargs["guidance_rescale"] = (
+                    self.args.validation_guidance_rescale
+                )
+            if self.args.validation_guidance_real > 1.0:
+                pipeline_kwargs["guidance_scale_real"] = float(
+                    self.args.validation_guidance_real
+                )
+            if (
+                isinstance(self.args.validation_no_cfg_until_timestep, int)
+                and self.args.model_family == "flux"
+            ):
+                pipeline_kwargs["no_cfg_until_timestep"] = (
+                    self.args.validation_no_cfg_until_timestep
+                )
+            if self.model_family == "flux":
+                pipeline_kwargs.pop("negative_prompt", None)
+            if self.args.model_family == "sana":
+                pipeline_kwargs["complex_human_instruction"] = (
+                    self.args.sana_complex_human_instruction
+                )
+
+            try:
+                all_validation_type_results = {}
+                for current_validation_type in self._validation_types():
+                    if not self.args.validation_randomize:
+                        pipeline_kwargs["generator"] = self._get_generator()
+                    if current_validation_type == "ema":
+                        self.enable_ema_for_inference()
+                    with torch.inference_mode(), self._inference_autocast():
+                        all_validation_type_results[current_validation_type] = (
+                            self.pipeline(**pipeline_kwargs).images
+                        )
+                    if current_validation_type == "ema":
+                        self.disable_ema_for_inference()
+            except Exception as e:
+                import traceback
+
+                logger.error(
+                    f"Error generating validation image batch: {e}, {traceback.format_exc()}"
+                )
+                continue
+
+            ema_image_results = all_validation_type_results.get("ema")
+            validation_image_results = all_validation_type_results.get(
+                "checkpoint", ema_image_results
+            )
+            benchmark_ready = not self.args.disable_benchmark and self.benchmark_exists(
+                "base_model"
+            )
+            # pipeline outputs are ordered prompt-major; slice each prompt's
+            # images back out for the per-shortname bookkeeping.
+            for prompt_idx, validation_shortname in enumerate(shortnames):
+                start = prompt_idx * num_images
+                prompt_images = validation_image_results[start : start + num_images]
+                checkpoint_validation_images[validation_shortname].extend(
+                    prompt_images
+                )
+                stitched_images = list(prompt_images)
+                if benchmark_ready:
+                    benchmark_image = self._benchmark_image(
+                        validation_shortname, resolution
+                    )
+                    if benchmark_image is not None:
+                        stitched_images = [
+                            self.stitch_benchmark_image(
+                                validation_image_result=image,
+                                benchmark_image=benchmark_image,
+                            )
+                            for image in stitched_images
+                        ]
+                stitched_validation_images[validation_shortname].extend(
+                    stitched_images
+                )
+                if self.args.use_ema and ema_image_results is not None:
+                    ema_validation_images[validation_shortname].extend(
+                        ema_image_results[start : start + num_images]
+                    )
+
+        return (
+            stitched_validation_images,
+            checkpoint_validation_images,
+            ema_validation_images,
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _res_to_label(res):
+        if "x" in res:
+            return str(res)
+        if type(res) is tuple:
+            return f"{res[0]}x{res[1]}"
+        return f"{res}x{res}"
+
     def _save_images(self, validation_images, validation_shortname, validation_prompt):
-        validation_img_idx = 0
-        for validation_image in validation_images[validation_shortname]:
-            res = self.validation_resolutions[validation_img_idx]
-            if "x" in res:
-                res_label = str(res)
-            elif type(res) is tuple:
-                res_label = f"{res[0]}x{res[1]}"
-            else:
-                res_label = f"{res}x{res}"
-            validation_image.save(
-                os.path.join(
-                    self.save_dir,
-                    f"step_{StateTracker.get_global_step()}_{validation_shortname}_{res_label}.png",
+        global_step = StateTracker.get_global_step()
+        res_labels = self._resolution_labels
+        for validation_img_idx, validation_image in enumerate(
+            validation_images[validation_shortname]
+        ):
+            # queue the PNG encode on the shared save pool; PIL releases the
+            # GIL around libpng so the writes overlap the next generation.
+            self._save_futures.append(
+                self._save_pool.submit(
+                    validation_image.save,
+                    os.path.join(
+                        self.save_dir,
+                        f"step_{global_step}_{validation_shortname}_{res_labels[validation_img_idx]}.png",
+                    ),
                 )
             )
-            validation_img_idx += 1
+
+    def _drain_webhook_queue(self):
+        while True:
+            message, images = self._webhook_queue.get()
+            try:
+                StateTracker.get_webhook_handler().send(message, images=images)
+            except Exception as e:
+                logger.debug(f"Webhook send failed: {e}")
+            finally:
+                self._webhook_queue.task_done()
+
+    def _enqueue_webhook(self, message, images):
+        """Queue a webhook payload for the background sender thread.
+
+        The HTTP POST (and multipart image upload) happens off the training
+        thread; when the queue backs up, enqueue blocks briefly to let the
+        sender catch up rather than silently dropping messages — a payload
+        is only discarded once the endpoint has stalled past the timeout.
+        """
+        if self._webhook_queue is None:
+            self._webhook_queue = queue.Queue(maxsize=16)
+            self._webhook_thread = threading.Thread(
+                target=self._drain_webhook_queue, daemon=True
+            )
+            self._webhook_thread.start()
+        try:
+            self._webhook_queue.put((message, images), timeout=30)
+        except queue.Full:
+            logger.warning(
+                "Webhook endpoint is not keeping up; dropping a validation payload."
+            )
+
+    def _flush_webhook_queue(self, timeout: float = 30.0):
+        """Wait for the background sender to finish the queued payloads.
+
+        The sender is a daemon thread, so without a flush the process can
+        exit right after the final validation with completion webhooks still
+        queued. Bounded by a timeout so a dead endpoint cannot hang teardown.
+        """
+        if self._webhook_queue is None:
+            return
+        deadline = time.monotonic() + timeout
+        while self._webhook_queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
 
     def _log_validations_to_webhook(
         self, validation_images, validation_shortname, validation_prompt
     ):
         if StateTracker.get_webhook_handler() is not None:
-            StateTracker.get_webhook_handler().send(
+            self._enqueue_webhook(
                 (
                     f"Validation image for `{validation_shortname if validation_shortname != '' else '(blank shortname)'}`"
                     f"\nValidation prompt: `{validation_prompt if validation_prompt != '' else '(blank prompt)'}`"
                     f"\nEvaluation score: {self.eval_scores.get(validation_shortname, 'N/A')}"
                 ),
-                images=validation_images[validation_shortname],
+                validation_images[validation_shortname],
             )
 
     def _log_validations_to_trackers(self, validation_images):
+        global_step = StateTracker.get_global_step()
+        validation_resolutions = self.validation_resolutions
+        resolution_list = self._resolution_strings
         for tracker in self.accelerator.trackers:
             if tracker.name == "comet_ml":
                 experiment = self.accelerator.get_tracker("comet_ml").tracker
@@ -1534,27 +2337,26 @@ class Validation:
                     for idx, image in enumerate(image_list):
                         experiment.log_image(
                             image,
-                            name=f"{shortname} - {self.validation_resolutions[idx]}",
+                            name=f"{shortname} - {validation_resolutions[idx]}",
                         )
             elif tracker.name == "tensorboard":
                 tracker = self.accelerator.get_tracker("tensorboard")
                 for shortname, image_list in validation_images.items():
                     tracker.log_images(
                         {
-                            f"{shortname} - {self.validation_resolutions[idx]}": np.moveaxis(
-                                np.array(image), -1, 0
+                            # np.asarray is a zero-copy view of the PIL buffer
+                            # and transpose is a view, so the single
+                            # ascontiguousarray pass is the only copy.
+                            f"{shortname} - {validation_resolutions[idx]}": np.ascontiguousarray(
+                                np.asarray(image).transpose(2, 0, 1)
                             )[
                                 np.newaxis, ...
                             ]
                             for idx, image in enumerate(image_list)
                         },
-                        step=StateTracker.get_global_step(),
+                        step=global_step,
                     )
             elif tracker.name == "wandb":
-                resolution_list = [
-                    f"{res[0]}x{res[1]}" for res in get_validation_resolutions()
-                ]
-
                 if self.args.tracker_image_layout == "table":
                     columns = [
                         "Prompt",
@@ -1565,18 +2367,16 @@ class Validation:
 
                     # Process each prompt and its associated images
                     for prompt_shortname, image_list in validation_images.items():
-                        wandb_images = []
-                        luminance_values = []
                         logger.debug(
                             f"Prompt {prompt_shortname} has {len(image_list)} images"
                         )
-                        for image in image_list:
-                            logger.debug(f"Adding to table: {image}")
-                            wandb_image = wandb.Image(image)
-                            wandb_images.append(wandb_image)
-                            luminance = calculate_luminance(image)
-                            luminance_values.append(luminance)
-                        mean_luminance = torch.tensor(luminance_values).mean().item()
+                        # wandb.Image re-encodes to PNG and releases the GIL
+                        # while doing so, so the conversions overlap.
+                        wandb_images = list(self._save_pool.map(wandb.Image, image_list))
+                        # one vectorized pass over the whole image set instead
+                        # of a PIL->numpy conversion per image.
+                        luminance_values = calculate_image_set_luminance(image_list)
+                        mean_luminance = sum(luminance_values) / len(luminance_values)
                         while len(wandb_images) < len(resolution_list):
                             # any missing images will crash it. use None so they are indexed.
                             logger.debug("Found a missing image - masking with a None")
@@ -1586,7 +2386,7 @@ class Validation:
                     # Log the table to Weights & Biases
                     tracker.log(
                         {"Validation Gallery": table},
-                        step=StateTracker.get_global_step(),
+                        step=global_step,
                     )
 
                 elif self.args.tracker_image_layout == "gallery":
@@ -1595,17 +2395,19 @@ class Validation:
                         logger.debug(
                             f"Prompt {prompt_shortname} has {len(image_list)} images"
                         )
-                        for idx, image in enumerate(image_list):
-                            wandb_image = wandb.Image(
-                                image,
-                                caption=f"{prompt_shortname} - {resolution_list[idx]}",
-                            )
-                            gallery_images[
-                                f"{prompt_shortname} - {resolution_list[idx]}"
-                            ] = wandb_image
+                        captions = [
+                            f"{prompt_shortname} - {resolution_list[idx]}"
+                            for idx in range(len(image_list))
+                        ]
+                        wandb_imgs = self._save_pool.map(
+                            lambda pair: wandb.Image(pair[0], caption=pair[1]),
+                            zip(image_list, captions),
+                        )
+                        for caption, wandb_image in zip(captions, wandb_imgs):
+                            gallery_images[caption] = wandb_image
 
                     # Log all images in one call to prevent the global step from ticking
-                    tracker.log(gallery_images, step=StateTracker.get_global_step())
+                    tracker.log(gallery_images, step=global_step)
 
     def _primary_model(self):
         if self.args.controlnet:
@@ -1620,6 +2422,19 @@ class Validation:
             logger.debug("EMA already enabled. Not enabling EMA.")
             return
         if self.args.use_ema:
+            if (
+                self.ema_model.cur_decay_value == 0.0
+                and (self.args.ema_update_interval or 1) == 1
+            ):
+                # during EMA warmup the decay is zero and every step copies the
+                # live weights straight into the shadow, so the two are
+                # numerically identical and the store/copy/restore cycle would
+                # be a full-model no-op copy. Leaving ema_enabled unset also
+                # makes the matching disable call a no-op.
+                logger.debug(
+                    "EMA shadow still tracks the live weights exactly; skipping swap."
+                )
+                return
             logger.debug("Enabling EMA.")
             self.ema_enabled = True
             if self.args.model_type == "lora":
@@ -1680,7 +2495,9 @@ class Validation:
             else:
                 logger.debug("Restoring trainable parameters.")
                 self.ema_model.restore(self.trainable_parameters())
-            if self.args.ema_device != "accelerator":
+            if self.args.ema_device != "accelerator" and not getattr(
+                self.args, "ema_keep_on_device", False
+            ):
                 logger.debug("Moving EMA weights to CPU for storage.")
                 self.ema_model.to(self.args.ema_device)
                 self._primary_model().to(self.inference_device)
@@ -1692,12 +2509,30 @@ class Validation:
 
     def finalize_validation(self, validation_type):
         """Cleans up and restores original state if necessary."""
+        # hand the encoders back to the trainer on-device; the on-demand
+        # embed caches expect to find them where they were left.
+        self._restore_auxiliaries()
+        # settle any in-flight webhook sends before control leaves the
+        # validation — after the final run the process may exit immediately.
+        self._flush_webhook_queue()
+        if (
+            getattr(self.args, "warm_validation", False)
+            and validation_type != "final"
+        ):
+            # warm validations keep the VAE and pipeline resident, skipping
+            # the PCIe round-trip and the device-wide empty_cache sync.
+            return
         if not self.args.keep_vae_loaded and not self.args.vae_cache_ondemand:
             self.vae = self.vae.to("cpu")
             self.vae = None
-        self.pipeline = None
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
+            # the resident pipeline references the offloaded VAE, so it has
+            # to be rebuilt for the next validation.
+            self.pipeline = None
+            self._pipeline_on_device = False
+            if torch.cuda.is_available():
+                # empty_cache serializes the device; only pay for it when the
+                # VAE allocation was actually released.
+                torch.cuda.empty_cache()
 
     def evaluate_images(self, images: list = None):
         if self.model_evaluator is None:
@@ -1706,15 +2541,27 @@ class Validation:
             if shortname in self.eval_scores:
                 continue
             prompt = self.validation_prompt_dict.get(shortname, "")
-            for image in image_list:
-                evaluation_score = self.model_evaluator.evaluate([image], [prompt])
+            if len({image.size for image in image_list}) == 1:
+                # one batched evaluator forward for the whole prompt; the
+                # metric reduces to the mean score over the batch.
+                evaluation_score = self.model_evaluator.evaluate(
+                    image_list, [prompt] * len(image_list)
+                )
                 self.eval_scores[shortname] = round(float(evaluation_score), 4)
+            else:
+                # mixed resolutions cannot be stacked into one tensor.
+                for image in image_list:
+                    evaluation_score = self.model_evaluator.evaluate([image], [prompt])
+                    self.eval_scores[shortname] = round(float(evaluation_score), 4)
         # Log the scores into dict: {"min", "max", "mean", "std"}
+        scores = np.fromiter(
+            self.eval_scores.values(), dtype=np.float32, count=len(self.eval_scores)
+        )
         result = {
-            "clip/min": min(self.eval_scores.values()),
-            "clip/max": max(self.eval_scores.values()),
-            "clip/mean": np.mean(list(self.eval_scores.values())),
-            "clip/std": np.std(list(self.eval_scores.values())),
+            "clip/min": float(scores.min()),
+            "clip/max": float(scores.max()),
+            "clip/mean": float(scores.mean()),
+            "clip/std": float(scores.std()),
         }
 
         return result
@@ -0,0 +1,8 @@
+import os
+
+
+def pytest_configure(config):
+    # Quiet the helpers' loggers before any test module imports them; doing
+    # this once per process instead of at test-module import time keeps the
+    # write out of every collection pass and xdist worker re-import.
+    os.environ.setdefault("SIMPLETUNER_LOG_LEVEL", "CRITICAL")
@@ -1,162 +1,283 @@
 # test_trainer.py
 
+import contextlib
+import copy
+import importlib
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, Mock, patch, MagicMock
 import torch, os
 
-os.environ["SIMPLETUNER_LOG_LEVEL"] = "CRITICAL"
-from helpers.training.trainer import Trainer
+# Patch targets, spelled out once; mock.patch re-parses and re-imports the
+# target string on every entry, so at least keep the literals in one place.
+TRAINER_MOD = "helpers.training.trainer"
+STATE_TRACKER = "helpers.training.state_tracker.StateTracker"
+
+# One sentinel serves every patch that only needs "some Mock" back; nothing
+# asserts on these return values, so they can all share a single object.
+_RV_MOCK = Mock(name="return_value_sentinel")
+_SCHEDULER_RESULT = (Mock(), None, Mock())
+
+# Everything the tests touch on the accelerator stand-in; a list spec keeps
+# attribute lookups to one small dict and turns typos into AttributeError
+# without the class inspection that autospec=True would pay for.
+ACCELERATOR_FIELDS = (
+    "is_main_process",
+    "num_processes",
+    "load_state",
+    "wait_for_everyone",
+)
+
+def _apply(*decorators):
+    """Bundle a decorator stack so shared patch sets are declared once.
+
+    mock.patch decorators copy themselves on application, so one bundle can
+    safely decorate any number of tests.
+    """
+
+    def wrap(fn):
+        for decorator in reversed(decorators):
+            fn = decorator(fn)
+        return fn
+
+    return wrap
+
+
+# delete_cache_files is patched through the trainer module's own StateTracker
+# binding — that is the reference the code under test calls, and it stays the
+# real class while the class-level patcher covers the state_tracker module.
+_BACKEND_CACHE_PATCHES = _apply(
+    patch(f"{TRAINER_MOD}.os.makedirs"),
+    patch(f"{TRAINER_MOD}.StateTracker.delete_cache_files"),
+)
+
+
+class _FlagMock:
+    """Callable stub that only remembers whether it ran.
+
+    For targets the tests check with a bare assert_called(), this skips the
+    _Call bookkeeping a Mock performs on every invocation.
+    """
+
+    def __init__(self, return_value=None):
+        self.called = False
+        self.return_value = return_value
+
+    def __call__(self, *args, **kwargs):
+        self.called = True
+        return self.return_value
+
+
+def _flag_logger():
+    return SimpleNamespace(
+        debug=_FlagMock(),
+        info=_FlagMock(),
+        warning=_FlagMock(),
+        error=_FlagMock(),
+    )
+
+
+# Constant test inputs, allocated once rather than per run.
+_CONFIG_DICT = {"a": 1, "b": 2}
+_CHECKPOINT_DIRS = ["checkpoint-100", "checkpoint-200"]
+
+# test_misc_init runs with disable_accelerator=True, so this stand-in only
+# needs the device attribute; two namespaces replace a nested Mock tree.
+_FAKE_ACCEL = SimpleNamespace(device=SimpleNamespace(type="cuda"))
+
+# Parsed-argument payload for test_misc_init. This stays a MagicMock rather
+# than an argparse.Namespace because the real parse_arguments/_misc_init path
+# reads attributes beyond the ones pinned here (base_model_precision and
+# friends) and relies on them resolving to benign auto-generated values.
+_ARGS_NS = MagicMock(
+    torch_num_threads=2,
+    train_batch_size=1,
+    weight_dtype=torch.float32,
+    optimizer="adamw_bf16",
+    max_train_steps=2,
+    num_train_epochs=0,
+    timestep_bias_portion=0,
+    metadata_update_interval=100,
+    gradient_accumulation_steps=1,
+    mixed_precision="bf16",
+    report_to="none",
+    output_dir="output_dir",
+    flux_schedule_shift=3,
+    flux_schedule_auto_shift=False,
+    validation_guidance_skip_layers=None,
+    gradient_checkpointing_interval=None,
+)
 
 
 class TestTrainer(unittest.TestCase):
-    @patch("helpers.training.trainer.load_config")
-    @patch("helpers.training.trainer.safety_check")
-    @patch(
-        "helpers.training.trainer.load_scheduler_from_args",
-        return_value=(Mock(), None, Mock()),
+    @classmethod
+    def setUpClass(cls):
+        # Importing the trainer module pulls in accelerate, diffusers and the
+        # rest of the heavy dependency chain; deferring it here keeps pytest
+        # collection of unrelated suites from paying for it.
+        cls.Trainer = importlib.import_module(TRAINER_MOD).Trainer
+        # Already imported as a side effect of the trainer module; holding the
+        # class lets in-test patches use patch.object instead of re-resolving
+        # the dotted target string on every entry.
+        cls.StateTracker = importlib.import_module(
+            "helpers.training.state_tracker"
+        ).StateTracker
+        # Several tests used to patch the StateTracker module attribute
+        # individually; one class-lifetime patcher with a per-test
+        # reset_mock() replaces those installs. The trainer module keeps its
+        # own from-import binding, so this is as inert to the code under
+        # test as the per-test decorators were.
+        cls._state_tracker_patcher = patch(STATE_TRACKER)
+        cls._state_tracker = cls._state_tracker_patcher.start()
+        # The config stand-in only ever has its attributes read, so a plain
+        # namespace is enough; the accelerator stays a Mock because tests
+        # assert on calls like load_state().
+        cls._config_proto = SimpleNamespace()
+        cls._accelerator_proto = Mock(spec_set=list(ACCELERATOR_FIELDS))
+        # One Trainer serves every no-argument test; __init__ still does
+        # real work under the patches, so running it once and restoring the
+        # attribute snapshot per test is cheaper than reconstructing.
+        with patch.object(cls.Trainer, "_misc_init"), patch.object(
+            cls.Trainer, "parse_arguments"
+        ):
+            cls._shared_trainer = cls.Trainer()
+        cls._trainer_snapshot = dict(cls._shared_trainer.__dict__)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._state_tracker_patcher.stop()
+
+    def setUp(self):
+        # Every test quiesces Trainer() construction the same way; entering
+        # the two patches once here replaces the identical decorator pair
+        # that used to sit on each test method.
+        self._state_tracker.reset_mock()
+        self._stack = contextlib.ExitStack()
+        # patch.object skips the string-target parsing and module import
+        # that patch() repeats on every entry.
+        self.mock_misc_init = self._stack.enter_context(
+            patch.object(self.Trainer, "_misc_init", return_value=_RV_MOCK)
+        )
+        self.mock_parse_args = self._stack.enter_context(
+            patch.object(
+                self.Trainer, "parse_arguments", return_value=_RV_MOCK
+            )
+        )
+
+    def tearDown(self):
+        self._stack.close()
+
+    def _fresh_trainer(self):
+        trainer = self._shared_trainer
+        trainer.__dict__.clear()
+        trainer.__dict__.update(self._trainer_snapshot)
+        return trainer
+
+    def _make_config(self, **attrs):
+        config = copy.copy(self._config_proto)
+        for name, value in attrs.items():
+            setattr(config, name, value)
+        return config
+
+    @patch.multiple(
+        TRAINER_MOD,
+        load_config=DEFAULT,
+        safety_check=DEFAULT,
+        load_scheduler_from_args=DEFAULT,
+        Accelerator=DEFAULT,
     )
-    @patch("helpers.training.state_tracker.StateTracker")
     @patch(
-        "helpers.training.state_tracker.StateTracker.set_model_family",
+        f"{STATE_TRACKER}.set_model_family",
         return_value=True,
     )
-    @patch("torch.set_num_threads")
-    @patch("helpers.training.trainer.Accelerator")
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
     def test_config_to_obj(
         self,
-        mock_misc_init,
-        mock_parse_args,
-        mock_accelerator,
-        mock_set_num_threads,
         mock_set_model_family,
-        mock_state_tracker,
-        mock_load_scheduler_from_args,
-        mock_safety_check,
-        mock_load_config,
+        **mocks,
     ):
-        trainer = Trainer()
-        config_dict = {"a": 1, "b": 2}
-        config_obj = trainer._config_to_obj(config_dict)
+        mocks["load_scheduler_from_args"].return_value = _SCHEDULER_RESULT
+        trainer = self._fresh_trainer()
+        config_obj = trainer._config_to_obj(_CONFIG_DICT)
         self.assertEqual(config_obj.a, 1)
         self.assertEqual(config_obj.b, 2)
 
         config_none = trainer._config_to_obj(None)
         self.assertIsNone(config_none)
 
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("helpers.training.trainer.set_seed")
-    def test_init_seed_with_value(self, mock_set_seed, mock_parse_args, mock_misc_init):
-        trainer = Trainer()
-        trainer.config = Mock(seed=42, seed_for_each_device=False)
-        trainer.init_seed()
-        mock_set_seed.assert_called_with(42, False)
-
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("helpers.training.trainer.set_seed")
-    def test_init_seed_none(self, mock_set_seed, mock_parse_args, mock_misc_init):
-        trainer = Trainer()
-        trainer.config = Mock(seed=None, seed_for_each_device=False)
-        trainer.init_seed()
-        mock_set_seed.assert_not_called()
-
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("torch.cuda.is_available", return_value=True)
+    @patch(f"{TRAINER_MOD}.set_seed")
+    def test_init_seed(self, mock_set_seed):
+        trainer = self._fresh_trainer()
+        for seed in (42, None):
+            with self.subTest(seed=seed):
+                mock_set_seed.reset_mock()
+                trainer.config = self._make_config(
+                    seed=seed, seed_for_each_device=False
+                )
+                trainer.init_seed()
+                if seed is not None:
+                    mock_set_seed.assert_called_with(seed, False)
+                else:
+                    mock_set_seed.assert_not_called()
+
     @patch("torch.cuda.memory_allocated", return_value=1024**3)
-    def test_stats_memory_used_cuda(
-        self, mock_memory_allocated, mock_is_available, mock_parse_args, mock_misc_init
-    ):
-        trainer = Trainer()
-        memory_used = trainer.stats_memory_used()
-        self.assertEqual(memory_used, 1.0)
-
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("torch.cuda.is_available", return_value=False)
-    @patch("torch.backends.mps.is_available", return_value=True)
     @patch("torch.mps.current_allocated_memory", return_value=1024**3)
-    def test_stats_memory_used_mps(
-        self,
-        mock_current_allocated_memory,
-        mock_mps_is_available,
-        mock_cuda_is_available,
-        mock_parse_args,
-        mock_misc_init,
-    ):
-        trainer = Trainer()
-        memory_used = trainer.stats_memory_used()
-        self.assertEqual(memory_used, 1.0)
-
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("torch.cuda.is_available", return_value=False)
-    @patch("torch.backends.mps.is_available", return_value=False)
-    @patch("helpers.training.trainer.logger")
-    def test_stats_memory_used_none(
+    @patch(f"{TRAINER_MOD}.logger")
+    def test_stats_memory_used(
         self,
         mock_logger,
-        mock_mps_is_available,
-        mock_cuda_is_available,
-        mock_parse_args,
-        mock_misc_init,
+        mock_current_allocated_memory,
+        mock_memory_allocated,
     ):
-        trainer = Trainer()
-        memory_used = trainer.stats_memory_used()
-        self.assertEqual(memory_used, 0)
-        mock_logger.warning.assert_called_with(
-            "CUDA, ROCm, or Apple MPS not detected here. We cannot report VRAM reductions."
-        )
+        # One trainer serves all three backend scenarios; only the
+        # availability flags cycle per subTest.
+        trainer = self._fresh_trainer()
+        for backend, cuda_available, mps_available, expected in (
+            ("cuda", True, False, 1.0),
+            ("mps", False, True, 1.0),
+            ("none", False, False, 0),
+        ):
+            with self.subTest(backend=backend):
+                with patch(
+                    "torch.cuda.is_available", return_value=cuda_available
+                ), patch(
+                    "torch.backends.mps.is_available", return_value=mps_available
+                ):
+                    self.assertEqual(trainer.stats_memory_used(), expected)
+                if backend == "none":
+                    mock_logger.warning.assert_called_with(
+                        "CUDA, ROCm, or Apple MPS not detected here. We cannot report VRAM reductions."
+                    )
 
     @patch("torch.set_num_threads")
-    @patch("helpers.training.state_tracker.StateTracker.set_global_step")
-    @patch("helpers.training.state_tracker.StateTracker.set_args")
-    @patch("helpers.training.state_tracker.StateTracker.set_weight_dtype")
-    @patch("helpers.training.trainer.Trainer.set_model_family")
-    @patch("helpers.training.trainer.Trainer.init_noise_schedule")
-    @patch(
-        "accelerate.accelerator.Accelerator",
-        return_value=Mock(device=Mock(type="cuda")),
+    @patch.multiple(
+        f"{TRAINER_MOD}.Trainer",
+        set_model_family=DEFAULT,
+        init_noise_schedule=DEFAULT,
     )
+    @patch("accelerate.accelerator.Accelerator", return_value=_FAKE_ACCEL)
     @patch("accelerate.state.AcceleratorState", Mock())
-    @patch(
-        "argparse.ArgumentParser.parse_args",
-        return_value=MagicMock(
-            torch_num_threads=2,
-            train_batch_size=1,
-            weight_dtype=torch.float32,
-            optimizer="adamw_bf16",
-            max_train_steps=2,
-            num_train_epochs=0,
-            timestep_bias_portion=0,
-            metadata_update_interval=100,
-            gradient_accumulation_steps=1,
-            mixed_precision="bf16",
-            report_to="none",
-            output_dir="output_dir",
-            flux_schedule_shift=3,
-            flux_schedule_auto_shift=False,
-            validation_guidance_skip_layers=None,
-            gradient_checkpointing_interval=None,
-        ),
-    )
+    @patch("argparse.ArgumentParser.parse_args", return_value=_ARGS_NS)
     def test_misc_init(
         self,
         mock_argparse,
         # mock_accelerator_state,
         mock_accelerator,
-        mock_init_noise_schedule,
-        mock_set_model_family,
-        mock_set_weight_dtype,
-        mock_set_args,
-        mock_set_global_step,
         mock_set_num_threads,
+        **mocks,
     ):
-        trainer = Trainer(disable_accelerator=True)
-        trainer._misc_init()
+        # This test exercises the real _misc_init/parse_arguments, so the
+        # common patches from setUp have to come off first. The StateTracker
+        # setters are patched on the real class (the trainer module holds a
+        # from-import binding the class-level patcher does not cover).
+        self._stack.close()
+        with patch.multiple(
+            self.StateTracker,
+            set_global_step=DEFAULT,
+            set_args=DEFAULT,
+            set_weight_dtype=DEFAULT,
+        ) as st_mocks:
+            trainer = self.Trainer(disable_accelerator=True)
+            trainer._misc_init()
         mock_set_num_threads.assert_called_with(2)
         self.assertEqual(
             trainer.state,
@@ -168,42 +289,33 @@ class TestTrainer(unittest.TestCase):
         self.assertIsNone(trainer.bf)
         self.assertIsNone(trainer.grad_norm)
         self.assertEqual(trainer.extra_lr_scheduler_kwargs, {})
-        mock_set_global_step.assert_called_with(0)
-        mock_set_args.assert_called_with(trainer.config)
-        mock_set_weight_dtype.assert_called_with(trainer.config.weight_dtype)
-        mock_set_model_family.assert_called()
-        mock_init_noise_schedule.assert_called()
-
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
+        st_mocks["set_global_step"].assert_called_with(0)
+        st_mocks["set_args"].assert_called_with(trainer.config)
+        st_mocks["set_weight_dtype"].assert_called_with(trainer.config.weight_dtype)
+        mocks["set_model_family"].assert_called()
+        mocks["init_noise_schedule"].assert_called()
+
     @patch(
-        "helpers.training.trainer.load_scheduler_from_args",
+        f"{TRAINER_MOD}.load_scheduler_from_args",
         return_value=(Mock(), "flow_matching_value", "noise_scheduler_value"),
     )
-    def test_init_noise_schedule(
-        self, mock_load_scheduler_from_args, mock_parse_args, mock_misc_init
-    ):
-        trainer = Trainer()
-        trainer.config = Mock()
+    def test_init_noise_schedule(self, mock_load_scheduler_from_args):
+        trainer = self._fresh_trainer()
+        trainer.config = self._make_config()
         trainer.init_noise_schedule()
         self.assertEqual(trainer.config.flow_matching, "flow_matching_value")
         self.assertEqual(trainer.noise_scheduler, "noise_scheduler_value")
         self.assertEqual(trainer.lr, 0.0)
 
-    @patch("helpers.training.trainer.logger")
-    @patch(
-        "helpers.training.trainer.model_classes", {"full": ["sdxl", "sd3", "legacy"]}
-    )
-    @patch(
-        "helpers.training.trainer.model_labels",
-        {"sdxl": "SDXL", "sd3": "SD3", "legacy": "Legacy"},
+    @patch.multiple(
+        TRAINER_MOD,
+        model_classes={"full": ["sdxl", "sd3", "legacy"]},
+        model_labels={"sdxl": "SDXL", "sd3": "SD3", "legacy": "Legacy"},
     )
-    @patch("helpers.training.state_tracker.StateTracker")
-    def test_set_model_family_default(self, mock_state_tracker, mock_logger):
-        with patch("helpers.training.trainer.Trainer._misc_init"):
-            with patch("helpers.training.trainer.Trainer.parse_arguments"):
-                trainer = Trainer()
-        trainer.config = Mock(model_family=None)
+    @patch(f"{TRAINER_MOD}.logger", new_callable=_flag_logger)
+    def test_set_model_family_default(self, mock_logger, **mocks):
+        trainer = self._fresh_trainer()
+        trainer.config = self._make_config(model_family=None)
         trainer.config.pretrained_model_name_or_path = "some/path"
         trainer.config.pretrained_vae_model_name_or_path = None
         trainer.config.vae_path = None
@@ -211,21 +323,20 @@ class TestTrainer(unittest.TestCase):
         trainer.config.text_encoder_subfolder = None
         trainer.config.model_family = None
 
-        with patch.object(trainer, "_set_model_paths") as mock_set_model_paths:
-            with patch(
-                "helpers.training.state_tracker.StateTracker.is_sdxl_refiner",
-                return_value=False,
+        with patch.object(
+            trainer, "_set_model_paths", new_callable=_FlagMock
+        ) as mock_set_model_paths:
+            with patch.object(
+                self.StateTracker, "is_sdxl_refiner", return_value=False
             ):
                 trainer.set_model_family()
                 self.assertEqual(trainer.config.model_type_label, "SDXL")
-                mock_logger.warning.assert_called()
-                mock_set_model_paths.assert_called()
-
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    def test_set_model_family_invalid(self, mock_parse_args, mock_misc_init):
-        trainer = Trainer()
-        trainer.config = Mock(model_family="invalid_model_family")
+                self.assertTrue(mock_logger.warning.called)
+                self.assertTrue(mock_set_model_paths.called)
+
+    def test_set_model_family_invalid(self):
+        trainer = self._fresh_trainer()
+        trainer.config = self._make_config(model_family="invalid_model_family")
         trainer.config.pretrained_model_name_or_path = "some/path"
         with self.assertRaises(ValueError) as context:
             trainer.set_model_family()
@@ -234,127 +345,101 @@ class TestTrainer(unittest.TestCase):
             str(context.exception),
         )
 
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("helpers.training.trainer.logger")
-    @patch("helpers.training.state_tracker.StateTracker")
-    def test_epoch_rollover(
-        self, mock_state_tracker, mock_logger, mock_parse_args, mock_misc_init
-    ):
-        trainer = Trainer()
+    @patch(f"{TRAINER_MOD}.logger")
+    def test_epoch_rollover(self, mock_logger):
+        # _epoch_rollover only touches state/config/extra_lr_scheduler_kwargs,
+        # so __new__ skips even the patched-out __init__.
+        trainer = self.Trainer.__new__(self.Trainer)
         trainer.state = {"first_epoch": 1, "current_epoch": 1}
-        trainer.config = Mock(
+        trainer.config = self._make_config(
             num_train_epochs=5,
             aspect_bucket_disable_rebuild=False,
             lr_scheduler="cosine_with_restarts",
         )
         trainer.extra_lr_scheduler_kwargs = {}
-        with patch(
-            "helpers.training.state_tracker.StateTracker.get_data_backends",
-            return_value={},
-        ):
+        with patch.object(self.StateTracker, "get_data_backends", return_value={}):
             trainer._epoch_rollover(2)
             self.assertEqual(trainer.state["current_epoch"], 2)
             self.assertEqual(trainer.extra_lr_scheduler_kwargs["epoch"], 2)
 
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    def test_epoch_rollover_same_epoch(self, mock_misc_init, mock_parse_args):
-        trainer = Trainer(
-            config={
-                "--num_train_epochs": 0,
-                "--model_family": "pixart_sigma",
-                "--optimizer": "adamw_bf16",
-                "--pretrained_model_name_or_path": "some/path",
-            }
-        )
+    def test_epoch_rollover_same_epoch(self):
+        trainer = self.Trainer.__new__(self.Trainer)
         trainer.state = {"first_epoch": 1, "current_epoch": 1}
         trainer._epoch_rollover(1)
         self.assertEqual(trainer.state["current_epoch"], 1)
 
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("helpers.training.trainer.os.makedirs")
-    @patch("helpers.training.state_tracker.StateTracker.delete_cache_files")
+    @_BACKEND_CACHE_PATCHES
     def test_init_clear_backend_cache_preserve(
-        self, mock_delete_cache_files, mock_makedirs, mock_parse_args, mock_misc_init
+        self, mock_delete_cache_files, mock_makedirs
     ):
-        trainer = Trainer()
-        trainer.config = Mock(
+        trainer = self._fresh_trainer()
+        trainer.config = self._make_config(
             output_dir="/path/to/output", preserve_data_backend_cache=True
         )
         trainer.init_clear_backend_cache()
         mock_makedirs.assert_called_with("/path/to/output", exist_ok=True)
         mock_delete_cache_files.assert_not_called()
 
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("helpers.training.trainer.os.makedirs")
-    @patch("helpers.training.state_tracker.StateTracker.delete_cache_files")
+    @_BACKEND_CACHE_PATCHES
     def test_init_clear_backend_cache_delete(
-        self, mock_delete_cache_files, mock_makedirs, mock_parse_args, mock_misc_init
+        self, mock_delete_cache_files, mock_makedirs
     ):
-        trainer = Trainer()
-        trainer.config = Mock(
+        trainer = self._fresh_trainer()
+        trainer.config = self._make_config(
             output_dir="/path/to/output", preserve_data_backend_cache=False
         )
         trainer.init_clear_backend_cache()
         mock_makedirs.assert_called_with("/path/to/output", exist_ok=True)
         mock_delete_cache_files.assert_called_with(preserve_data_backend_cache=False)
 
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("helpers.training.trainer.huggingface_hub")
-    @patch("helpers.training.trainer.HubManager")
-    @patch("helpers.training.state_tracker.StateTracker")
+    @patch.multiple(
+        TRAINER_MOD,
+        huggingface_hub=DEFAULT,
+        HubManager=DEFAULT,
+    )
     @patch("accelerate.logging.MultiProcessAdapter.log")
     def test_init_huggingface_hub(
         self,
         mock_logger,
-        mock_state_tracker,
-        mock_hub_manager_class,
-        mock_hf_hub,
-        mock_parse_args,
-        mock_misc_init,
+        **mocks,
     ):
-        trainer = Trainer()
-        trainer.config = Mock(push_to_hub=True, huggingface_token="fake_token")
-        trainer.accelerator = Mock(is_main_process=True)
-        mock_hf_hub.whoami = Mock(return_value={"id": "fake_id", "name": "foobar"})
+        mock_hf_hub = mocks["huggingface_hub"]
+        mock_hub_manager_class = mocks["HubManager"]
+        trainer = self._fresh_trainer()
+        trainer.config = self._make_config(
+            push_to_hub=True, huggingface_token="fake_token"
+        )
+        trainer.accelerator = copy.copy(self._accelerator_proto)
+        trainer.accelerator.is_main_process = True
+        mock_hf_hub.whoami = _FlagMock(
+            return_value={"id": "fake_id", "name": "foobar"}
+        )
         trainer.init_huggingface_hub(access_token="fake_token")
         mock_hf_hub.login.assert_called_with(token="fake_token")
         mock_hub_manager_class.assert_called_with(config=trainer.config)
-        mock_hf_hub.whoami.assert_called()
+        self.assertTrue(mock_hf_hub.whoami.called)
 
-    @patch("helpers.training.trainer.Trainer._misc_init", return_value=Mock())
-    @patch("helpers.training.trainer.Trainer.parse_arguments", return_value=Mock())
-    @patch("helpers.training.trainer.logger")
-    @patch("helpers.training.trainer.os.path.basename", return_value="checkpoint-100")
-    @patch(
-        "helpers.training.trainer.os.listdir",
-        return_value=["checkpoint-100", "checkpoint-200"],
+    @patch(f"{TRAINER_MOD}.logger", new_callable=_flag_logger)
+    @patch.multiple(
+        f"{TRAINER_MOD}.os.path",
+        basename=DEFAULT,
+        exists=DEFAULT,
     )
-    @patch(
-        "helpers.training.trainer.os.path.join",
-        side_effect=lambda *args: "/".join(args),
-    )
-    @patch("helpers.training.trainer.os.path.exists", return_value=True)
-    @patch("helpers.training.trainer.Accelerator")
-    @patch("helpers.training.state_tracker.StateTracker")
+    @patch(f"{TRAINER_MOD}.os.listdir", return_value=_CHECKPOINT_DIRS)
+    @patch(f"{TRAINER_MOD}.Accelerator")
     def test_init_resume_checkpoint(
         self,
-        mock_state_tracker,
         mock_accelerator_class,
-        mock_path_exists,
-        mock_path_join,
         mock_os_listdir,
-        mock_path_basename,
         mock_logger,
-        mock_parse_args,
-        mock_misc_init,
+        **mocks,
     ):
-        trainer = Trainer()
-        trainer.config = Mock(
+        # The real os.path.join is pure and deterministic on these string
+        # inputs, so there is no reason to route every call through a mock.
+        mocks["basename"].return_value = "checkpoint-100"
+        mocks["exists"].return_value = True
+        trainer = self._fresh_trainer()
+        trainer.config = self._make_config(
             output_dir="/path/to/output",
             resume_from_checkpoint="latest",
             total_steps_remaining_at_start=100,
@@ -362,7 +447,8 @@ class TestTrainer(unittest.TestCase):
             num_train_epochs=0,
             max_train_steps=100,
         )
-        trainer.accelerator = Mock(num_processes=1)
+        trainer.accelerator = copy.copy(self._accelerator_proto)
+        trainer.accelerator.num_processes = 1
         trainer.state = {"global_step": 0, "first_epoch": 1, "current_epoch": 1}
         trainer.optimizer = Mock()
         trainer.config.lr_scheduler = "constant"
@@ -374,16 +460,10 @@ class TestTrainer(unittest.TestCase):
         lr_scheduler = Mock()
         lr_scheduler.state_dict.return_value = {"base_lrs": [0.1], "_last_lr": [0.1]}
 
-        with patch(
-            "helpers.training.state_tracker.StateTracker.get_data_backends",
-            return_value={},
-        ):
-            with patch(
-                "helpers.training.state_tracker.StateTracker.get_global_step",
-                return_value=100,
-            ):
+        with patch.object(self.StateTracker, "get_data_backends", return_value={}):
+            with patch.object(self.StateTracker, "get_global_step", return_value=100):
                 trainer.init_resume_checkpoint(lr_scheduler=lr_scheduler)
-                mock_logger.info.assert_called()
+                self.assertTrue(mock_logger.info.called)
                 trainer.accelerator.load_state.assert_called_with(
                     "/path/to/output/checkpoint-200"
                 )